@@ -0,0 +1,261 @@
+# backend/benchmarks/section_classifier.py
+
+"""
+Benchmark y exactitud del clasificador de secciones
+Uso (desde backend/):
+    python -m benchmarks.section_classifier build
+        Extrae (título, contenido) únicos de sections_raw al corpus etiquetado.
+        Las secciones nuevas llegan con la etiqueta sugerida por el clasificador
+        actual y reviewed=false; las ya revisadas no se tocan.
+    python -m benchmarks.section_classifier run [--impl A B ...]
+        Mide títulos/segundo, latencia p50/p99 por llamada y precision/recall
+        por categoría de cada implementación. Con dos o más implementaciones,
+        falla (exit 1) si alguna pierde exactitud respecto de la primera.
+        Para comparar versiones de patrones: --impl classifier classifier:otros_patrones.py
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import BENCHMARK_CORPUS_PATH
+from database import iter_jobs_sections_raw
+from utils.section_classifier import SectionClassifier, SECTION_PATTERNS, _section_classifier_reference
+
+# Etiqueta usada en las métricas cuando la sección no calza con ninguna categoría
+NO_MATCH = '(sin categoría)'
+
+
+def load_patterns(path: str) -> dict:
+    """Cargar SECTION_PATTERNS desde un archivo .py alternativo"""
+    spec = importlib.util.spec_from_file_location("alt_section_patterns", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.SECTION_PATTERNS
+
+
+def build_implementations(patterns: dict, min_score: int) -> Dict[str, Callable]:
+    """
+    Implementaciones comparables: cada una recibe (título, contenido) y devuelve
+    la categoría. Se crean nuevas en cada corrida para medir con cache fría.
+    """
+    def reference(title, content):
+        return _section_classifier_reference(title, min_score)
+
+    def classifier(title, content):
+        return uncached.classify(title)
+
+    def cached(title, content):
+        return memoized.classify(title)
+
+    def title_content(title, content):
+        return memoized_content.classify(title) or memoized_content.classify_content(content)
+
+    uncached = SectionClassifier(patterns, min_score, cache_size=0)
+    memoized = SectionClassifier(patterns, min_score)
+    memoized_content = SectionClassifier(patterns, min_score)
+
+    implementations = {
+        'classifier': classifier,
+        'cached': cached,
+        'title+content': title_content,
+    }
+    # La referencia recorre siempre SECTION_PATTERNS del módulo
+    if patterns is SECTION_PATTERNS:
+        implementations['reference'] = reference
+    return implementations
+
+
+def build_corpus(path: str = BENCHMARK_CORPUS_PATH) -> int:
+    """
+    Agregar al corpus las secciones de sections_raw que aún no están
+    Returns: Número de secciones nuevas
+    """
+    corpus = load_corpus(path) if os.path.exists(path) else []
+    seen = {(item['title'], item['content']) for item in corpus}
+    suggester = SectionClassifier()
+
+    added = 0
+    for job in iter_jobs_sections_raw():
+        for section in job['sections']:
+            key = (section.get('title', ''), section.get('content', ''))
+            if key in seen:
+                continue
+            seen.add(key)
+            title, content = key
+            corpus.append({
+                'title': title,
+                'content': content,
+                'label': suggester.classify(title) or suggester.classify_content(content),
+                'reviewed': False,
+            })
+            added += 1
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, ensure_ascii=False, indent=2)
+    reviewed = sum(1 for item in corpus if item['reviewed'])
+    print(f"✓ Corpus: {len(corpus)} secciones ({added} nuevas, {reviewed} revisadas) en {path}")
+    return added
+
+
+def load_corpus(path: str = BENCHMARK_CORPUS_PATH) -> List[dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def evaluate(implementation: Callable, corpus: List[dict], repeat: int = 1) -> dict:
+    """
+    Correr una implementación sobre el corpus
+    Returns: Diccionario con throughput, latencias, exactitud y métricas por categoría
+    """
+    latencies = []
+    predictions = []
+    start = time.perf_counter()
+    for round_number in range(repeat):
+        for item in corpus:
+            call_start = time.perf_counter()
+            prediction = implementation(item['title'], item['content'])
+            latencies.append(time.perf_counter() - call_start)
+            if round_number == 0:
+                predictions.append(prediction)
+    elapsed = time.perf_counter() - start
+
+    # Precision / recall por categoría (NO_MATCH incluido como una clase más)
+    counts = {}
+    correct = 0
+    for item, prediction in zip(corpus, predictions):
+        expected = item['label'] or NO_MATCH
+        predicted = prediction or NO_MATCH
+        for category in (expected, predicted):
+            counts.setdefault(category, {'tp': 0, 'fp': 0, 'fn': 0})
+        if predicted == expected:
+            counts[expected]['tp'] += 1
+            correct += 1
+        else:
+            counts[predicted]['fp'] += 1
+            counts[expected]['fn'] += 1
+
+    per_category = {}
+    for category, c in counts.items():
+        predicted_total = c['tp'] + c['fp']
+        expected_total = c['tp'] + c['fn']
+        per_category[category] = {
+            'precision': c['tp'] / predicted_total if predicted_total else None,
+            'recall': c['tp'] / expected_total if expected_total else None,
+            'support': expected_total,
+        }
+
+    latencies.sort()
+    return {
+        'titles_per_second': len(latencies) / elapsed if elapsed else float('inf'),
+        'p50_ms': _percentile(latencies, 50) * 1000,
+        'p99_ms': _percentile(latencies, 99) * 1000,
+        'accuracy': correct / len(corpus),
+        'per_category': per_category,
+        'predictions': predictions,
+    }
+
+
+def _format_ratio(value: Optional[float]) -> str:
+    return f"{value:6.1%}" if value is not None else "     -"
+
+
+def print_report(name: str, result: dict):
+    print(f"\n{'='*50}")
+    print(f"{name}")
+    print(f"{'='*50}")
+    print(f"Títulos/segundo: {result['titles_per_second']:,.0f}")
+    print(f"Latencia p50: {result['p50_ms']:.3f} ms | p99: {result['p99_ms']:.3f} ms")
+    print(f"Exactitud: {result['accuracy']:.1%}")
+    print(f"{'Categoría':<22} {'Precision':>9} {'Recall':>7} {'Soporte':>8}")
+    for category, metrics in sorted(result['per_category'].items()):
+        print(f"{category:<22} {_format_ratio(metrics['precision']):>9} "
+              f"{_format_ratio(metrics['recall']):>7} {metrics['support']:>8}")
+
+
+def run(names: List[str], corpus_path: str, min_score: int,
+        repeat: int, tolerance: float, reviewed_only: bool) -> int:
+    """
+    Evaluar y comparar implementaciones
+    Args: names: Implementaciones como 'nombre' o 'nombre:archivo_de_patrones.py'
+    Returns: Código de salida (1 si hay regresión de exactitud frente a la primera)
+    """
+    corpus = load_corpus(corpus_path)
+    if reviewed_only:
+        corpus = [item for item in corpus if item['reviewed']]
+    if not corpus:
+        print("✗ Corpus vacío: ejecutar primero 'build' (o revisar etiquetas)")
+        return 1
+    print(f"Corpus: {len(corpus)} secciones, {repeat} repeticiones")
+
+    results = {}
+    for name in names:
+        impl_name, _, patterns_path = name.partition(':')
+        patterns = load_patterns(patterns_path) if patterns_path else SECTION_PATTERNS
+        implementations = build_implementations(patterns, min_score)
+        if impl_name not in implementations:
+            print(f"✗ Implementación desconocida: {name} (disponibles: {', '.join(implementations)})")
+            return 1
+        results[name] = evaluate(implementations[impl_name], corpus, repeat)
+        print_report(name, results[name])
+
+    if len(names) < 2:
+        return 0
+
+    # Comparación contra la primera implementación (la línea base)
+    baseline_name = names[0]
+    baseline = results[baseline_name]
+    print(f"\n{'='*50}")
+    print(f"COMPARACIÓN (base: {baseline_name})")
+    print(f"{'='*50}")
+    exit_code = 0
+    for name in names[1:]:
+        result = results[name]
+        changed = sum(a != b for a, b in zip(baseline['predictions'], result['predictions']))
+        speedup = result['titles_per_second'] / baseline['titles_per_second']
+        delta = result['accuracy'] - baseline['accuracy']
+        print(f"{name}: {speedup:.1f}x títulos/s, exactitud {delta:+.1%}, {changed} predicciones distintas")
+        if delta < -tolerance:
+            print(f"✗ Regresión de exactitud en {name}")
+            exit_code = 1
+    return exit_code
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark y exactitud del clasificador de secciones")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="Construir/actualizar el corpus desde sections_raw")
+    build_parser.add_argument('--corpus', default=BENCHMARK_CORPUS_PATH)
+
+    run_parser = subparsers.add_parser('run', help="Medir y comparar implementaciones")
+    run_parser.add_argument('--corpus', default=BENCHMARK_CORPUS_PATH)
+    run_parser.add_argument('--impl', nargs='+', default=['reference', 'classifier'],
+                            help="Implementaciones a comparar ('nombre' o 'nombre:patrones.py'); "
+                                 "la primera es la base")
+    run_parser.add_argument('--min-score', type=int, default=70)
+    run_parser.add_argument('--repeat', type=int, default=3, help="Pasadas sobre el corpus para medir tiempos")
+    run_parser.add_argument('--tolerance', type=float, default=0.0,
+                            help="Caída de exactitud aceptada frente a la base (ej: 0.01)")
+    run_parser.add_argument('--reviewed-only', action='store_true',
+                            help="Usar solo secciones con etiqueta revisada")
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        build_corpus(args.corpus)
+        return 0
+    return run(args.impl, args.corpus, args.min_score, args.repeat, args.tolerance, args.reviewed_only)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
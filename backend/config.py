@@ -6,6 +6,7 @@ Contiene todas las constantes, paths y configuraciones compartidas
 """
 
 import os
+import re
 from datetime import datetime
 
 # ==================== PATHS ====================
@@ -14,6 +15,9 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = os.path.join(PROJECT_ROOT, "data")
 DB_PATH = os.path.join(DATA_PATH, "jobs.db")
 RAW_DATA_PATH = os.path.join(DATA_PATH, "raw")
+HTTP_CACHE_PATH = os.path.join(RAW_DATA_PATH, "http_cache")
+RAW_ARCHIVE_PATH = os.path.join(RAW_DATA_PATH, "archive")
+BENCHMARK_CORPUS_PATH = os.path.join(DATA_PATH, "benchmarks", "section_corpus.json")
 
 # ==================== SCRAPERS ====================
 # Configuración general de scraping
@@ -21,6 +25,45 @@ DEFAULT_TIMEOUT = 10
 DELAY_BETWEEN_REQUESTS = 1
 MAX_RETRIES = 3
 
+# Sesión HTTP y reintentos
+HTTP_POOL_SIZE = 10                              # Conexiones keep-alive reutilizables por host
+RETRY_BACKOFF_FACTOR = 1.0                       # Backoff exponencial: 1s, 2s, 4s...
+RETRY_BACKOFF_MAX = 60                           # Espera máxima entre reintentos (segundos)
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]   # Status que se reintentan (respetando Retry-After)
+
+# Cache HTTP en disco (revalidación con ETag / Last-Modified)
+HTTP_CACHE_ENABLED = True
+HTTP_CACHE_MAX_AGE_DAYS = 7                      # Entradas más antiguas se descartan
+HTTP_CACHE_MAX_BYTES = 500 * 1024 * 1024         # Tamaño máximo total (expulsión LRU)
+
+# Crawl concurrente de detalles
+DETAIL_CRAWL_WORKERS = 8        # Requests en vuelo simultáneas en modo concurrente
+MAX_CONCURRENCY_PER_HOST = 4    # Conexiones simultáneas máximas contra un mismo host
+MAX_REQUESTS_PER_SECOND = 5.0   # Techo global de requests por segundo
+
+# Rate limiter adaptativo (AIMD): sube de a poco, retrocede multiplicativamente
+RATE_LIMIT_INITIAL = 1.0        # Requests/segundo al partir
+RATE_LIMIT_MIN = 0.2            # Piso tras retrocesos sucesivos
+AIMD_INCREASE = 0.05            # Aumento aditivo por respuesta sana (req/s)
+AIMD_DECREASE_FACTOR = 0.5      # Factor multiplicativo ante 429, timeouts o latencia alta
+AIMD_LATENCY_FACTOR = 2.5       # Latencia > factor x latencia base = señal de saturación
+AIMD_LATENCY_FLOOR = 1.0        # Bajo estos segundos la latencia nunca gatilla retroceso
+AIMD_COOLDOWN_SECONDS = 2.0     # Tiempo mínimo entre dos retrocesos
+LISTING_SWEEP_WORKERS = 6       # Categorías recorridas en paralelo en el barrido de listados
+REPARSE_BATCH_SIZE = 200        # Ofertas por transacción al re-parsear el archivo HTML
+
+# Archivo de HTML crudo (blobs comprimidos por hash + índice en raw_pages)
+RAW_ARCHIVE_ENABLED = True
+RAW_ARCHIVE_COMPRESSION = 'zstd'        # 'zstd' (requiere zstandard) o 'gzip'
+
+# Motor de parseo del detalle de ofertas: 'bs4' (BeautifulSoup) o 'lxml' (una sola pasada)
+DETAIL_PARSER_ENGINE = 'bs4'
+
+# Lectura incremental del detalle: se corta la descarga si datePosted está fuera de rango
+DETAIL_STREAMING = True
+STREAM_CHUNK_SIZE = 16 * 1024           # Bytes leídos por iteración
+STREAM_SNIFF_MAX_BYTES = 512 * 1024     # Si no aparece datePosted antes de esto, se lee completo
+
 # Headers HTTP compartidos
 DEFAULT_HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -32,6 +75,8 @@ DEFAULT_HEADERS = {
 # ==================== GETONBOARD ====================
 GETONBOARD_BASE_URL = "https://www.getonbrd.com"
 GETONBOARD_JOBS_URL = f"{GETONBOARD_BASE_URL}/jobs"
+GETONBOARD_PAGE_PARAM = "page"          # Parámetro de paginación del listado (?page=2)
+GETONBOARD_MAX_LISTING_PAGES = 20       # Tope de páginas por categoría
 GETONBOARD_CATEGORIES = [
     "design-ux",
     "programming",
@@ -66,6 +111,41 @@ LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 Las entidades no están normalizadas aún.
 Usa SQL puro, y no un ORM de momento.
 """
+# Backend de almacenamiento del crawler (storage/): 'sqlite' o 'postgres'.
+# Con 'postgres' varios hosts pueden scrapear y guardar a la vez; la clasificación
+# de secciones, la búsqueda y el índice del archivo HTML siguen en SQLite local
+STORAGE_BACKEND = os.environ.get('JOBRADAR_STORAGE', 'sqlite')
+POSTGRES_DSN = os.environ.get('JOBRADAR_POSTGRES_DSN', 'postgresql://localhost:5432/jobradar')
+POSTGRES_POOL_MIN_SIZE = 1
+POSTGRES_POOL_MAX_SIZE = 10             # Conexiones por proceso (hilos de scraping + writer)
+POSTGRES_CLAIM_BATCH_SIZE = 50          # URLs que reserva cada host por vez para scrapear su detalle
+POSTGRES_CLAIM_LEASE_MINUTES = 30       # Tras este tiempo sin procesarse, otra reserva puede tomar la URL
+
+# Conexión SQLite (una por hilo, reutilizada)
+SQLITE_TIMEOUT = 30                     # Segundos esperando un lock antes de fallar
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",              # Lectores no bloquean al escritor
+    "synchronous": "NORMAL",            # fsync solo en checkpoints (seguro con WAL)
+    "mmap_size": 256 * 1024 * 1024,     # Lecturas vía memoria mapeada
+    "cache_size": -64000,               # ~64 MB de cache de páginas (negativo = KiB)
+    "temp_store": "MEMORY",
+}
+
+# Escritura por lotes de ofertas (write-behind)
+WRITE_BATCH_SIZE = 50                   # Ofertas por transacción
+WRITE_FLUSH_SECONDS = 2.0               # Máximo tiempo que una oferta espera en cola
+READ_CHUNK_SIZE = 500                   # Filas por página en los lectores por keyset
+CLASSIFY_BATCH_SIZE = 200               # Ofertas clasificadas por transacción
+SECTION_CACHE_PERSIST = True            # Guardar la clasificación de cada título en section_title_cache
+
+# Compresión de los textos largos de job_offers_text (JOB_OFFER_COMPRESSED_COLUMNS).
+# Los valores comprimidos quedan como BLOB: database.py los decodifica al leer y
+# en SQL se leen con decode_text(columna) desde get_db_connection
+TEXT_COMPRESSION = 'zstd'               # 'zstd' (requiere zstandard), 'zlib' o None (sin comprimir)
+TEXT_COMPRESSION_LEVEL = 9
+TEXT_COMPRESSION_MIN_BYTES = 128        # Textos más cortos se guardan tal cual
+TEXT_COMPRESSION_DICT_SIZE = 16 * 1024  # Bytes del diccionario zstd entrenado con las ofertas guardadas
+TEXT_COMPRESSION_DICT_SAMPLES = 5000    # Textos usados para entrenarlo (los más recientes)
 # Esquema SQL LISTA DE URLS JOBS
 SCHEMA_JOB_URLS = """
 CREATE TABLE IF NOT EXISTS job_urls (
@@ -86,7 +166,28 @@ INSERT OR IGNORE INTO job_urls
     VALUES (?, ?, ?, ?, ?, ?)
 """
 
+# Esquema SQL DEL ÍNDICE DEL ARCHIVO HTML (blobs en RAW_ARCHIVE_PATH)
+SCHEMA_RAW_PAGES = """
+CREATE TABLE IF NOT EXISTS raw_pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT,
+    job_id TEXT,
+    content_hash TEXT,
+    compression TEXT,
+    size INTEGER,
+    fetched_at TEXT
+);
+"""
+
+# Query INSERT AL ÍNDICE DEL ARCHIVO HTML
+INSERT_RAW_PAGE = """
+INSERT INTO raw_pages 
+    (url, job_id, content_hash, compression, size, fetched_at) 
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
 # Esquema SQL DE JOB OFFERS. REVISAR: docs/job_offer_schema.md
+# Es el esquema base (versión 0): las columnas nuevas se agregan en MIGRATIONS
 SCHEMA_JOB_OFFERS = """
 CREATE TABLE IF NOT EXISTS job_offers (
     id INTEGER PRIMARY KEY,
@@ -167,9 +268,8 @@ CREATE TABLE IF NOT EXISTS job_offers (
 );
 """
 
-# Query INSERT A JOB OFFERS
-INSERT_JOB_OFFER = """
-INSERT OR IGNORE INTO job_offers (
+# Columnas que escribe _job_offer_values, en orden
+JOB_OFFER_INSERT_COLUMNS = """
     job_id, source_url, portal_name, scraped_at, posted_date,
     job_title_raw, job_title_normalized, job_category_raw, job_role,
     company_name_raw, company_url_raw, company_type, company_description_raw,
@@ -196,8 +296,245 @@ INSERT OR IGNORE INTO job_offers (
     llm_processed,
     llm_processed_at, llm_confidence_score, processing_notes, is_active,
     last_checked_at, applications_raw, application_deadline, reply_time_raw,
-    remote_policy_raw, apply_url
-) VALUES (
-    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
-);
-"""
\ No newline at end of file
+    remote_policy_raw, apply_url,
+    sections_hash
+""".replace(",", " ").split()
+
+# Campos de job_offers que vienen del scraper (los que se pisan al re-parsear)
+JOB_OFFER_SCRAPED_COLUMNS = [
+    "source_url", "portal_name", "scraped_at", "posted_date",
+    "job_title_raw", "job_category_raw", "company_name_raw", "company_url_raw",
+    "company_description_raw", "location_work_mode_raw", "location_raw",
+    "work_mode_raw", "seniority_raw", "employment_type_raw", "salary_disclosed",
+    "salary_raw", "salary_min_raw", "salary_max_raw", "salary_currency_raw",
+    "salary_unit_raw", "salary_type_raw", "tech_stack_raw", "sections_raw",
+    "perks_raw", "last_checked_at", "applications_raw", "reply_time_raw",
+    "remote_policy_raw", "apply_url", "sections_hash",
+]
+
+# HOT/COLD: job_offers se guarda en dos tablas con la misma clave job_id
+#   job_offers_core: columnas escalares/filtrables (fechas, sueldo, ubicación...)
+#   job_offers_text: textos largos (secciones, descripciones, JSON)
+# y la vista job_offers las une con el esquema original para los lectores.
+JOB_OFFER_TEXT_COLUMNS = [
+    "company_description_raw", "requirements_raw", "tech_stack_raw",
+    "skills_required", "skills_preferred", "job_description_raw", "sections_raw",
+    "job_summary_llm", "responsibilities_llm", "benefits_raw", "benefits_parsed_llm",
+    "perks_raw", "responsibilities", "requirements", "nice_to_have",
+    "candidate_profile", "benefits", "work_conditions", "selection_process",
+    "how_to_apply", "others", "processing_notes",
+]
+
+# Columnas de job_offers_text que se guardan comprimidas (ver TEXT_COMPRESSION)
+JOB_OFFER_COMPRESSED_COLUMNS = [
+    "company_description_raw", "requirements_raw", "job_description_raw", "sections_raw",
+    "benefits_raw", "responsibilities", "requirements", "nice_to_have", "candidate_profile",
+    "benefits", "work_conditions", "selection_process", "how_to_apply", "others",
+]
+
+# Definición de cada columna: esquema base + columnas agregadas en MIGRATIONS
+JOB_OFFER_COLUMN_DEFS = dict(re.findall(r"^[ \t]+(\w+) ([^,\n]+),?$", SCHEMA_JOB_OFFERS, re.MULTILINE))
+JOB_OFFER_COLUMN_DEFS.update({
+    "sections_hash": "TEXT",
+    "classified_sections_hash": "TEXT",
+    "classifier_version": "TEXT",
+})
+JOB_OFFER_COLUMNS = list(JOB_OFFER_COLUMN_DEFS)
+JOB_OFFER_CORE_COLUMNS = [c for c in JOB_OFFER_COLUMNS if c not in JOB_OFFER_TEXT_COLUMNS]
+
+SCHEMA_JOB_OFFERS_CORE = (
+    "CREATE TABLE IF NOT EXISTS job_offers_core (\n"
+    + ",\n".join(f"    {c} {JOB_OFFER_COLUMN_DEFS[c]}" for c in JOB_OFFER_CORE_COLUMNS)
+    + "\n);"
+)
+
+SCHEMA_JOB_OFFERS_TEXT = (
+    "CREATE TABLE IF NOT EXISTS job_offers_text (\n"
+    "    job_id TEXT PRIMARY KEY,\n"
+    + ",\n".join(f"    {c} {JOB_OFFER_COLUMN_DEFS[c]}" for c in JOB_OFFER_TEXT_COLUMNS)
+    + "\n);"
+)
+
+# Vista de compatibilidad: mismas columnas y orden que la tabla original
+VIEW_JOB_OFFERS = (
+    "CREATE VIEW IF NOT EXISTS job_offers AS SELECT\n"
+    + ",\n".join(f"    {'t' if c in JOB_OFFER_TEXT_COLUMNS else 'c'}.{c}" for c in JOB_OFFER_COLUMNS)
+    + "\nFROM job_offers_core c\nLEFT JOIN job_offers_text t ON t.job_id = c.job_id;"
+)
+
+
+def _insert_statement(table: str, columns: list, upsert_columns: list = None) -> str:
+    """INSERT OR IGNORE (o UPSERT por job_id si se indican columnas a pisar)"""
+    statement = (
+        f"INSERT {'' if upsert_columns else 'OR IGNORE '}INTO {table} ({', '.join(columns)})\n"
+        f"VALUES ({', '.join('?' * len(columns))})"
+    )
+    if upsert_columns:
+        statement += "\nON CONFLICT(job_id) DO UPDATE SET\n" + ",\n".join(
+            f"    {column} = excluded.{column}" for column in upsert_columns
+        )
+    return statement + ";"
+
+
+# Columnas de _job_offer_values que van a cada tabla (job_id va en ambas)
+JOB_OFFER_INSERT_CORE_COLUMNS = [c for c in JOB_OFFER_INSERT_COLUMNS if c not in JOB_OFFER_TEXT_COLUMNS]
+JOB_OFFER_INSERT_TEXT_COLUMNS = ["job_id"] + [c for c in JOB_OFFER_INSERT_COLUMNS if c in JOB_OFFER_TEXT_COLUMNS]
+
+# Query INSERT A JOB OFFERS (una por tabla)
+INSERT_JOB_OFFER_CORE = _insert_statement("job_offers_core", JOB_OFFER_INSERT_CORE_COLUMNS)
+INSERT_JOB_OFFER_TEXT = _insert_statement("job_offers_text", JOB_OFFER_INSERT_TEXT_COLUMNS)
+
+# Query UPSERT A JOB OFFERS (re-parseo desde el archivo HTML)
+UPSERT_JOB_OFFER_CORE = _insert_statement(
+    "job_offers_core", JOB_OFFER_INSERT_CORE_COLUMNS,
+    [c for c in JOB_OFFER_SCRAPED_COLUMNS if c not in JOB_OFFER_TEXT_COLUMNS]
+)
+UPSERT_JOB_OFFER_TEXT = _insert_statement(
+    "job_offers_text", JOB_OFFER_INSERT_TEXT_COLUMNS,
+    [c for c in JOB_OFFER_SCRAPED_COLUMNS if c in JOB_OFFER_TEXT_COLUMNS]
+)
+
+# Columnas de job_offers indexadas en job_offers_fts, con su peso en bm25
+# unicode61 + remove_diacritics 2: minúsculas y sin acentos, como normalize_text
+JOB_OFFERS_FTS_WEIGHTS = {
+    "job_title_raw": 10.0,
+    "company_name_raw": 5.0,
+    "tech_stack_raw": 5.0,
+    "company_description_raw": 1.0,
+    "responsibilities": 2.0,
+    "requirements": 2.0,
+    "nice_to_have": 1.0,
+    "candidate_profile": 1.0,
+    "benefits": 1.0,
+    "work_conditions": 1.0,
+    "others": 1.0,
+}
+JOB_OFFERS_FTS_COLUMNS = list(JOB_OFFERS_FTS_WEIGHTS)
+
+# MIGRACIONES DEL ESQUEMA
+# Se aplican en orden desde create_tables; la versión aplicada se guarda en
+# PRAGMA user_version (versión N = primeras N migraciones aplicadas).
+# Nunca editar una migración ya publicada: agregar una nueva al final.
+# Cada paso es:
+#   - un string SQL (CREATE INDEX, ALTER TABLE ... ADD COLUMN, UPDATE, ...)
+#   - ("rebuild", tabla, esquema): reconstruye la tabla con el nuevo CREATE TABLE,
+#     copiando las columnas en común (para cambios que ALTER TABLE no soporta)
+MIGRATIONS = [
+    ("Índices para consultas por estado, portal y fecha", [
+        "CREATE INDEX IF NOT EXISTS idx_job_urls_processed_scraped_at ON job_urls (processed, scraped_at)",
+        "CREATE INDEX IF NOT EXISTS idx_job_urls_portal ON job_urls (portal)",
+        "CREATE INDEX IF NOT EXISTS idx_job_urls_scraped_at ON job_urls (scraped_at)",
+        "CREATE INDEX IF NOT EXISTS idx_job_offers_posted_date ON job_offers (posted_date)",
+        "CREATE INDEX IF NOT EXISTS idx_job_offers_portal_posted_date ON job_offers (portal_name, posted_date)",
+        "CREATE INDEX IF NOT EXISTS idx_raw_pages_url ON raw_pages (url)",
+    ]),
+    # El rowid va implícito al final del índice: cubre processed = ? AND id < ? ORDER BY id
+    ("Índice para recorrer job_urls por keyset según processed", [
+        "CREATE INDEX IF NOT EXISTS idx_job_urls_processed ON job_urls (processed)",
+    ]),
+    # sections_hash: hash de sections_raw al guardar; classified_sections_hash y
+    # classifier_version: con qué contenido y qué versión del clasificador se clasificó
+    ("Estado de clasificación incremental de secciones", [
+        "ALTER TABLE job_offers ADD COLUMN sections_hash TEXT",
+        "ALTER TABLE job_offers ADD COLUMN classified_sections_hash TEXT",
+        "ALTER TABLE job_offers ADD COLUMN classifier_version TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_job_offers_classification "
+        "ON job_offers (classifier_version, sections_hash, classified_sections_hash)",
+    ]),
+    # Cache persistente de títulos: solo valen las filas del patterns_hash vigente
+    ("Cache persistente de clasificación de títulos de sección", [
+        """
+        CREATE TABLE IF NOT EXISTS section_title_cache (
+            title_norm TEXT NOT NULL,
+            patterns_hash TEXT NOT NULL,
+            category TEXT,
+            PRIMARY KEY (title_norm, patterns_hash)
+        ) WITHOUT ROWID
+        """,
+    ]),
+    # Tags tecnológicos normalizados (tech_stack_raw se conserva como JSON)
+    ("Tablas technologies y job_technologies", [
+        """
+        CREATE TABLE IF NOT EXISTS technologies (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            name_key TEXT NOT NULL UNIQUE
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS job_technologies (
+            job_offer_id INTEGER NOT NULL,
+            technology_id INTEGER NOT NULL,
+            PRIMARY KEY (job_offer_id, technology_id)
+        ) WITHOUT ROWID
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_job_technologies_technology ON job_technologies (technology_id, job_offer_id)",
+    ]),
+    # Búsqueda full-text: rowid = job_offers.id, se mantiene desde database.py
+    ("Índice de búsqueda full-text job_offers_fts", [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS job_offers_fts USING fts5("
+        f"{', '.join(JOB_OFFERS_FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')",
+        f"INSERT INTO job_offers_fts (rowid, {', '.join(JOB_OFFERS_FTS_COLUMNS)}) "
+        f"SELECT id, {', '.join(JOB_OFFERS_FTS_COLUMNS)} FROM job_offers",
+    ]),
+    # Hot/cold: se conservan los id (job_technologies y job_offers_fts los usan)
+    ("Separar job_offers en job_offers_core / job_offers_text con vista de compatibilidad", [
+        SCHEMA_JOB_OFFERS_CORE,
+        SCHEMA_JOB_OFFERS_TEXT,
+        f"INSERT INTO job_offers_core ({', '.join(JOB_OFFER_CORE_COLUMNS)}) "
+        f"SELECT {', '.join(JOB_OFFER_CORE_COLUMNS)} FROM job_offers",
+        f"INSERT INTO job_offers_text (job_id, {', '.join(JOB_OFFER_TEXT_COLUMNS)}) "
+        f"SELECT job_id, {', '.join(JOB_OFFER_TEXT_COLUMNS)} FROM job_offers WHERE job_id IS NOT NULL",
+        "DROP TABLE job_offers",
+        VIEW_JOB_OFFERS,
+        "CREATE INDEX IF NOT EXISTS idx_job_offers_posted_date ON job_offers_core (posted_date)",
+        "CREATE INDEX IF NOT EXISTS idx_job_offers_portal_posted_date ON job_offers_core (portal_name, posted_date)",
+        "CREATE INDEX IF NOT EXISTS idx_job_offers_classification "
+        "ON job_offers_core (classifier_version, sections_hash, classified_sections_hash)",
+    ]),
+    # Las filas existentes se comprimen con database.recompress_job_offers_text
+    ("Diccionarios zstd para comprimir columnas de texto", [
+        """
+        CREATE TABLE IF NOT EXISTS text_compression_dictionaries (
+            id INTEGER PRIMARY KEY,
+            algorithm TEXT NOT NULL,
+            dictionary BLOB NOT NULL,
+            samples INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+]
+
+# ==================== POSTGRESQL ====================
+# Esquema del backend 'postgres' (storage/postgres.py), idempotente. Mismas
+# columnas que en SQLite; job_offers es una sola tabla porque TOAST ya guarda
+# comprimidos y fuera de la fila los textos largos
+_POSTGRES_TYPES = {
+    "INTEGER PRIMARY KEY": "BIGSERIAL PRIMARY KEY",
+    "INTEGER": "BIGINT",
+    "REAL": "DOUBLE PRECISION",
+}
+POSTGRES_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS job_urls (
+        id BIGSERIAL PRIMARY KEY,
+        url TEXT UNIQUE,
+        posted_date TEXT,
+        portal TEXT,
+        category TEXT,
+        scraped_at TIMESTAMP,
+        processed BOOLEAN DEFAULT FALSE,
+        claimed_at TIMESTAMP
+    )
+    """,
+    # Bases creadas antes de las reservas de URLs
+    "ALTER TABLE job_urls ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP",
+    "CREATE TABLE IF NOT EXISTS job_offers (\n"
+    + ",\n".join(f"    {c} {_POSTGRES_TYPES.get(t, t)}" for c, t in JOB_OFFER_COLUMN_DEFS.items())
+    + "\n)",
+    "CREATE INDEX IF NOT EXISTS idx_job_urls_processed ON job_urls (processed, id)",
+    "CREATE INDEX IF NOT EXISTS idx_job_urls_portal ON job_urls (portal)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_posted_date ON job_offers (posted_date)",
+    "CREATE INDEX IF NOT EXISTS idx_job_offers_portal_posted_date ON job_offers (portal_name, posted_date)",
+]
@@ -6,45 +6,237 @@ Funciones para crear tablas, insertar y consultar datos
 """
 
 import sqlite3
+import hashlib
 import json
 import os
-from datetime import datetime
-from typing import List, Tuple, Optional
+import re
+import threading
+import queue
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Tuple, Optional
 from contextlib import contextmanager
 
 from config import (
     DB_PATH, 
-    DATA_PATH,
+    SQLITE_TIMEOUT,
+    SQLITE_PRAGMAS,
+    WRITE_BATCH_SIZE,
+    WRITE_FLUSH_SECONDS,
+    READ_CHUNK_SIZE,
     SCHEMA_JOB_URLS,
     INSERT_JOB_URL,
     SCHEMA_JOB_OFFERS,
-    INSERT_JOB_OFFER
+    JOB_OFFER_INSERT_COLUMNS,
+    JOB_OFFER_TEXT_COLUMNS,
+    JOB_OFFER_COMPRESSED_COLUMNS,
+    TEXT_COMPRESSION,
+    TEXT_COMPRESSION_LEVEL,
+    TEXT_COMPRESSION_MIN_BYTES,
+    TEXT_COMPRESSION_DICT_SIZE,
+    TEXT_COMPRESSION_DICT_SAMPLES,
+    INSERT_JOB_OFFER_CORE,
+    INSERT_JOB_OFFER_TEXT,
+    UPSERT_JOB_OFFER_CORE,
+    UPSERT_JOB_OFFER_TEXT,
+    SCHEMA_RAW_PAGES,
+    INSERT_RAW_PAGE,
+    MIGRATIONS,
+    JOB_OFFERS_FTS_COLUMNS,
+    JOB_OFFERS_FTS_WEIGHTS
 )
+from utils.section_classifier import normalize_text
+from utils.text_compression import TextCodec, train_dictionary
+
+
+# Una conexión reutilizable por hilo; _connections permite cerrarlas todas al salir
+_local = threading.local()
+_connections = []
+_connections_lock = threading.Lock()
+_generation = 0  # Se incrementa al cerrar todo: invalida las conexiones de los hilos
+# Un codec por archivo de BD: los id de diccionario son propios de cada BD
+_text_codecs = {}
+
+
+def _open_connection() -> sqlite3.Connection:
+    """Abrir una conexión configurada con SQLITE_PRAGMAS"""
+    # Asegurar que existe el directorio
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    # check_same_thread=False solo para poder cerrarla desde close_db_connections
+    conn = sqlite3.connect(DB_PATH, timeout=SQLITE_TIMEOUT, check_same_thread=False)
+    conn.row_factory = sqlite3.Row  # Para acceder por nombre de columna
+    for pragma, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    # Para leer columnas comprimidas desde SQL: SELECT decode_text(sections_raw) ...
+    conn.create_function("decode_text", 1, _text_codec(conn).decode, deterministic=True)
+    return conn
+
+
+def _read_compression_dictionary(path: str, dictionary_id: int) -> Optional[bytes]:
+    """Leer un diccionario con una conexión aparte (se llama desde el codec, incluso dentro de SQL)"""
+    conn = sqlite3.connect(path, timeout=SQLITE_TIMEOUT)
+    try:
+        row = conn.execute(
+            "SELECT dictionary FROM text_compression_dictionaries WHERE id = ?", (dictionary_id,)
+        ).fetchone()
+        return row[0] if row else None
+    finally:
+        conn.close()
+
+
+def _text_codec(conn: Optional[sqlite3.Connection] = None) -> TextCodec:
+    """
+    Codec de columnas de texto de la BD actual; al crearlo deja como vigente
+    el último diccionario zstd entrenado
+    """
+    codec = _text_codecs.get(DB_PATH)
+    if codec is not None:
+        return codec
+    if conn is None:
+        # Abrir la conexión del hilo ya crea el codec; si no, se crea con ella
+        with get_db_connection() as conn:
+            return _text_codec(conn)
+
+    path = DB_PATH
+    codec = TextCodec(
+        TEXT_COMPRESSION, TEXT_COMPRESSION_LEVEL, TEXT_COMPRESSION_MIN_BYTES,
+        dictionary_loader=lambda dictionary_id: _read_compression_dictionary(path, dictionary_id)
+    )
+    if codec.algorithm == 'zstd' and conn is not None:
+        try:
+            row = conn.execute(
+                "SELECT id, dictionary FROM text_compression_dictionaries "
+                "WHERE algorithm = 'zstd' ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        except sqlite3.OperationalError:
+            row = None  # BD sin migrar todavía
+        if row:
+            codec.add_dictionary(row[0], row[1])
+    with _connections_lock:
+        return _text_codecs.setdefault(path, codec)
+
+
+def _encode_text(column: str, value):
+    """Comprimir el valor si la columna está en JOB_OFFER_COMPRESSED_COLUMNS"""
+    return _text_codec().encode(value) if column in JOB_OFFER_COMPRESSED_COLUMNS else value
 
 
 @contextmanager
 def get_db_connection():
-    """Context manager para manejar conexiones a la base de datos"""
-    conn = None
+    """Context manager que entrega la conexión reutilizable del hilo actual"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.generation != _generation or _local.path != DB_PATH:
+        conn = _open_connection()
+        _local.conn, _local.generation, _local.path = conn, _generation, DB_PATH
+        with _connections_lock:
+            _connections.append(conn)
+
     try:
-        # Asegurar que existe el directorio
-        os.makedirs(DATA_PATH, exist_ok=True)
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row  # Para acceder por nombre de columna
         yield conn
-    finally:
-        if conn:
-            conn.close()
+    except Exception:
+        # Descartar lo que quedó a medias para no arrastrarlo al siguiente commit
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+def close_db_connections():
+    """Cerrar todas las conexiones abiertas (llamar al terminar el proceso)"""
+    global _generation
+    with _connections_lock:
+        for conn in _connections:
+            try:
+                conn.execute("PRAGMA optimize")
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error cerrando conexión: {e}")
+        _connections.clear()
+        _generation += 1
+    _local.conn = None
 
 
 def create_tables():
-    """Crear todas las tablas necesarias en la base de datos"""
+    """Crear todas las tablas necesarias en la base de datos y aplicar migraciones"""
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(SCHEMA_JOB_URLS)     # Crea la de urls
         cursor.execute(SCHEMA_JOB_OFFERS)   # Crea la de publicaciones
+        cursor.execute(SCHEMA_RAW_PAGES)    # Crea el índice del archivo HTML
         conn.commit()
         print(f"Tablas creadas/verificadas en: {DB_PATH}")
+    apply_migrations()
+
+
+def get_schema_version() -> int:
+    """Versión del esquema aplicada (PRAGMA user_version)"""
+    with get_db_connection() as conn:
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations() -> int:
+    """
+    Aplicar las migraciones pendientes de config.MIGRATIONS, cada una en su
+    propia transacción junto con el nuevo user_version
+    Returns: Versión del esquema tras migrar
+    """
+    version = get_schema_version()
+    with get_db_connection() as conn:
+        for number, (description, steps) in enumerate(MIGRATIONS[version:], version + 1):
+            conn.execute("BEGIN")
+            try:
+                for step in steps:
+                    if isinstance(step, tuple) and step[0] == "rebuild":
+                        _rebuild_table(conn, step[1], step[2])
+                    else:
+                        conn.execute(step)
+                conn.execute(f"PRAGMA user_version = {number}")
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                print(f"✗ Error en migración {number} ({description}): {e}")
+                raise
+            print(f"✓ Migración {number} aplicada: {description}")
+            version = number
+    return version
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row['name'] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _rebuild_table(conn: sqlite3.Connection, table: str, schema: str):
+    """
+    Reconstruir una tabla con un nuevo esquema conservando datos e índices
+    (procedimiento de SQLite: crear nueva, copiar, eliminar vieja, renombrar)
+    Args:
+        table: Nombre de la tabla a reconstruir
+        schema: CREATE TABLE con la definición nueva (con el nombre actual de la tabla)
+    """
+    new_table = f"{table}_new"
+    new_schema = re.sub(
+        rf"(CREATE TABLE (?:IF NOT EXISTS )?){table}\b", rf"\g<1>{new_table}", schema, count=1
+    )
+    indexes = [
+        row['sql'] for row in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+            (table,)
+        )
+    ]
+
+    conn.execute(f"DROP TABLE IF EXISTS {new_table}")
+    conn.execute(new_schema)
+    new_columns = set(_table_columns(conn, new_table))
+    common = ", ".join(c for c in _table_columns(conn, table) if c in new_columns)
+    conn.execute(f"INSERT INTO {new_table} ({common}) SELECT {common} FROM {table}")
+    conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+    # Recrear los índices cuyas columnas siguen existiendo
+    for index_sql in indexes:
+        try:
+            conn.execute(index_sql)
+        except sqlite3.OperationalError as e:
+            print(f"⚠ Índice omitido al reconstruir {table}: {e}")
 
 
 def insert_job_urls(jobs_data: List[Tuple[str, str]], portal: str, category: str) -> int:
@@ -56,6 +248,20 @@ def insert_job_urls(jobs_data: List[Tuple[str, str]], portal: str, category: str
         category: Categoría del trabajo (ej: 'programming')
     Returns: Número de registros insertados
     """
+    return insert_job_urls_bulk(
+        [(url, posted_date, category) for url, posted_date in jobs_data],
+        portal=portal
+    )
+
+
+def insert_job_urls_bulk(jobs_data: List[Tuple[str, str, str]], portal: str) -> int:
+    """
+    Insertar URLs de varias categorías en una sola transacción
+    Args:
+        jobs_data: Lista de tuplas (url, posted_date, category)
+        portal: Nombre del portal (ej: 'getonbrd.com')
+    Returns: Número de registros insertados
+    """
     if not jobs_data:
         return 0
     
@@ -63,9 +269,10 @@ def insert_job_urls(jobs_data: List[Tuple[str, str]], portal: str, category: str
         cursor = conn.cursor()
         
         # Preparar datos para executemany
+        scraped_at = datetime.now()
         insert_data = [
-            (url, posted_date, portal, category, datetime.now(), False)
-            for url, posted_date in jobs_data
+            (url, posted_date, portal, category, scraped_at, False)
+            for url, posted_date, category in jobs_data
         ]
         
         cursor.executemany(INSERT_JOB_URL, insert_data)
@@ -76,7 +283,77 @@ def insert_job_urls(jobs_data: List[Tuple[str, str]], portal: str, category: str
         return inserted_count
 
 
+def insert_raw_pages(pages: List[Tuple]) -> int:
+    """
+    Registrar páginas archivadas en el índice raw_pages
+    Args: pages: Lista de tuplas (url, job_id, content_hash, compression, size, fetched_at)
+    Returns: Número de registros insertados
+    """
+    if not pages:
+        return 0
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(INSERT_RAW_PAGE, pages)
+        conn.commit()
+        return cursor.rowcount
+
+
+def _iter_keyset(table: str, columns: str = "*", where: str = "", params: tuple = (),
+                 chunk_size: int = READ_CHUNK_SIZE, descending: bool = False) -> Iterator[sqlite3.Row]:
+    """
+    Recorrer una tabla por páginas de tamaño fijo usando keyset (id > ?)
+    Solo una página vive en memoria; cada página es una consulta nueva, así que
+    se puede escribir en la BD mientras se itera
+    Args:
+        table: Tabla a recorrer (debe tener id INTEGER PRIMARY KEY)
+        columns: Columnas a seleccionar (se agrega id si no está)
+        where: Condición adicional (sin WHERE) con placeholders
+        params: Parámetros de la condición
+        chunk_size: Filas por página
+        descending: Recorrer desde el id más alto (más reciente) hacia atrás
+    """
+    if columns != "*":
+        columns = f"id, {columns}"
+    operator, order = ("<", "DESC") if descending else (">", "ASC")
+    condition = f" AND ({where})" if where else ""
+    query = f"SELECT {columns} FROM {table} WHERE id {operator} ?{condition} ORDER BY id {order} LIMIT ?"
+
+    last_id = 2 ** 63 - 1 if descending else 0
+    while True:
+        with get_db_connection() as conn:
+            rows = conn.execute(query, (last_id, *params, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1]['id']
+
+
 # UTILS: De tabla: job_urls
+def iter_job_urls(processed: Optional[bool] = None, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[sqlite3.Row]:
+    """
+    Iterar registros completos de job_urls, de los más recientes a los más antiguos
+    Args:
+        processed: Filtrar por estado (None = todos)
+        chunk_size: Filas leídas por consulta
+    """
+    if processed is None:
+        return _iter_keyset("job_urls", chunk_size=chunk_size, descending=True)
+    return _iter_keyset("job_urls", where="processed = ?", params=(1 if processed else 0,),
+                        chunk_size=chunk_size, descending=True)
+
+
+def count_job_urls(processed: Optional[bool] = None) -> int:
+    """Contar registros de job_urls (opcionalmente filtrados por estado)"""
+    with get_db_connection() as conn:
+        if processed is None:
+            return conn.execute("SELECT COUNT(*) FROM job_urls").fetchone()[0]
+        return conn.execute(
+            "SELECT COUNT(*) FROM job_urls WHERE processed = ?", (1 if processed else 0,)
+        ).fetchone()[0]
+
 def get_job_urls_full(processed: Optional[bool] = None, limit: Optional[int] = None) -> List[sqlite3.Row]:
     """Obtener registros completos de job_urls"""
     with get_db_connection() as conn:
@@ -134,16 +411,240 @@ def get_job_count_by_portal() -> List[Tuple[str, int]]:
 
 def get_recent_jobs(days: int = 7) -> List[sqlite3.Row]:
     """Obtener trabajos scrapeados en los últimos N días"""
+    # Comparar contra un string (mismo formato que scraped_at) permite usar el índice
+    since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute("""
             SELECT * FROM job_urls 
-            WHERE datetime(scraped_at) > datetime('now', '-' || ? || ' days')
+            WHERE scraped_at > ?
             ORDER BY scraped_at DESC
-        """, (days,))
+        """, (since,))
         return cursor.fetchall()
     
 
+def sections_hash(sections_raw: Optional[str]) -> Optional[str]:
+    """Hash del JSON de sections_raw (detecta ofertas cuyo contenido cambió)"""
+    if sections_raw is None:
+        return None
+    return hashlib.sha256(sections_raw.encode('utf-8')).hexdigest()
+
+
+def _job_offer_values(job_data: dict) -> tuple:
+    """
+    Mapear datos del scraper a los campos de JOB_OFFER_INSERT_COLUMNS
+    Args: job_data: Diccionario con los datos del trabajo (del scraper)
+    Returns: Tupla de valores en el orden de las columnas
+    """
+    sections_raw = json.dumps(job_data.get('sections_raw', []), ensure_ascii=False) if job_data.get('sections_raw') else None
+    return (
+        job_data.get('job_id'),
+        job_data.get('source_url'),
+        job_data.get('portal_name'),
+        job_data.get('scraped_at'),
+        job_data.get('posted_date'),
+        job_data.get('job_title_raw'),
+        None,  # job_title_normalized
+        job_data.get('job_category_raw'),
+        None,  # job_role
+        job_data.get('company_name_raw'),
+        job_data.get('company_url_raw'),
+        None,  # company_type
+        job_data.get('company_description_raw'),
+        job_data.get('location_work_mode_raw'),
+        job_data.get('location_raw'),
+        None,  # country
+        None,  # city
+        job_data.get('work_mode_raw'),
+        None,  # remote_location_allowed # puede ser bool, o str
+        job_data.get('seniority_raw'),
+        None,  # seniority_normalized
+        None,  # years_experience_min
+        None,  # years_experience_max
+        job_data.get('employment_type_raw'),
+        None,  # contract_duration_months
+        job_data.get('salary_disclosed'),
+        job_data.get('salary_raw'),
+        job_data.get('salary_min_raw'),
+        job_data.get('salary_max_raw'),
+        job_data.get('salary_currency_raw'),
+        job_data.get('salary_unit_raw'),
+        job_data.get('salary_type_raw'),
+        None,  # salary_frequency
+        None,  # salary_min_clp
+        None,  # salary_max_clp
+        None,  # salary_min_usd
+        None,  # salary_max_usd
+        None,  # salary_min_market_usd
+        None,  # salary_max_market_usd
+        0,  # salary_estimated_by_llm
+        None,  # requirements_raw
+        json.dumps(job_data.get('tech_stack_raw', []), ensure_ascii=False) if job_data.get('tech_stack_raw') else None,
+        None,  # main_techs
+        None,  # skills_required
+        None,  # skills_preferred
+        None,  # english_required
+        None,  # english_level
+        None,  # job_description_raw
+        sections_raw,
+        None,  # job_summary_llm
+        None,  # responsibilities_llm
+        None,  # benefits_raw
+        None,  # benefits_parsed_llm
+        json.dumps(job_data.get('perks_raw', []), ensure_ascii=False) if job_data.get('perks_raw') else None,
+        None, # responsibilities
+        None, # requirements
+        None, # nice_to_have
+        None, # candidate_profile
+        None, # benefits
+        None, # work_conditions
+        None, # selection_process
+        None, # how_to_apply
+        None, # others
+        0,  # llm_processed
+        None,  # llm_processed_at
+        None,  # llm_confidence_score
+        None,  # processing_notes
+        1,  # is_active
+        job_data.get('last_checked', datetime.now().isoformat()),
+        job_data.get('applications_raw'),
+        None,  # application_deadline
+        job_data.get('reply_time_raw'),
+        job_data.get('remote_policy_raw'),
+        job_data.get('apply_url'),
+        sections_hash(sections_raw)
+    )
+
+
+def _technology_key(name: str) -> str:
+    """Clave de deduplicación de un tag: sin espacios extra y en minúsculas"""
+    return ' '.join(name.split()).lower()
+
+
+def _chunks(items: list, size: int = 500):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _link_technologies(cursor: sqlite3.Cursor, techs_by_offer: dict, replace: bool = False) -> int:
+    """
+    Guardar los tags de varias ofertas en technologies / job_technologies
+    Args:
+        techs_by_offer: Diccionario job_offers.id -> lista de tags
+        replace: Si True, reemplaza los tags previos de cada oferta; si False,
+                 solo enlaza ofertas que aún no tienen tags
+    Returns: Número de enlaces insertados
+    """
+    offer_ids = list(techs_by_offer)
+    if replace:
+        cursor.executemany("DELETE FROM job_technologies WHERE job_offer_id = ?", [(i,) for i in offer_ids])
+    else:
+        for chunk in _chunks(offer_ids):
+            cursor.execute(
+                f"SELECT DISTINCT job_offer_id FROM job_technologies WHERE job_offer_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            for row in cursor.fetchall():
+                techs_by_offer.pop(row['job_offer_id'])
+
+    names = {}
+    for techs in techs_by_offer.values():
+        for name in techs:
+            if name and name.strip():
+                names.setdefault(_technology_key(name), name.strip())
+    if not names:
+        return 0
+
+    cursor.executemany(
+        "INSERT OR IGNORE INTO technologies (name, name_key) VALUES (?, ?)",
+        [(name, key) for key, name in names.items()]
+    )
+    technology_ids = {}
+    keys = list(names)
+    for chunk in _chunks(keys):
+        cursor.execute(
+            f"SELECT id, name_key FROM technologies WHERE name_key IN ({','.join('?' * len(chunk))})", chunk
+        )
+        technology_ids.update({row['name_key']: row['id'] for row in cursor.fetchall()})
+
+    links = {
+        (offer_id, technology_ids[_technology_key(name)])
+        for offer_id, techs in techs_by_offer.items()
+        for name in techs if name and name.strip()
+    }
+    cursor.executemany(
+        "INSERT OR IGNORE INTO job_technologies (job_offer_id, technology_id) VALUES (?, ?)", list(links)
+    )
+    return len(links)
+
+
+def _offer_ids(cursor: sqlite3.Cursor, job_ids: List[str]) -> dict:
+    """Resolver job_id -> job_offers.id"""
+    ids = {}
+    for chunk in _chunks(list(job_ids)):
+        cursor.execute(f"SELECT id, job_id FROM job_offers_core WHERE job_id IN ({','.join('?' * len(chunk))})", chunk)
+        ids.update({row['job_id']: row['id'] for row in cursor.fetchall()})
+    return ids
+
+
+# Columnas de job_offers_fts leídas desde job_offers (las comprimidas pasan por decode_text)
+_FTS_SOURCE_COLUMNS = ', '.join(
+    f"decode_text({column})" if column in JOB_OFFER_COMPRESSED_COLUMNS else column
+    for column in JOB_OFFERS_FTS_COLUMNS
+)
+
+
+def _sync_search_index(cursor: sqlite3.Cursor, offer_ids: List[int]):
+    """Reescribir en job_offers_fts las filas de las ofertas indicadas"""
+    columns = ', '.join(JOB_OFFERS_FTS_COLUMNS)
+    for chunk in _chunks(list(offer_ids)):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f"DELETE FROM job_offers_fts WHERE rowid IN ({placeholders})", chunk)
+        cursor.execute(
+            f"INSERT INTO job_offers_fts (rowid, {columns}) "
+            f"SELECT id, {_FTS_SOURCE_COLUMNS} FROM job_offers WHERE id IN ({placeholders})",
+            chunk
+        )
+
+
+def _after_offers_saved(cursor: sqlite3.Cursor, jobs_data: List[dict], replace: bool = False):
+    """
+    Mantener las tablas derivadas de ofertas recién guardadas (misma transacción):
+    tags en job_technologies y texto en job_offers_fts
+    Args: replace: True si las ofertas pudieron cambiar (upsert), reemplaza sus tags
+    """
+    ids = _offer_ids(cursor, [job['job_id'] for job in jobs_data if job.get('job_id')])
+    techs_by_offer = {ids[job['job_id']]: job.get('tech_stack_raw') or [] for job in jobs_data if job.get('job_id') in ids}
+    _link_technologies(cursor, techs_by_offer, replace)
+    _sync_search_index(cursor, list(ids.values()))
+
+
+# Posiciones de _job_offer_values que van a job_offers_core / job_offers_text
+_CORE_POSITIONS = [i for i, c in enumerate(JOB_OFFER_INSERT_COLUMNS) if c not in JOB_OFFER_TEXT_COLUMNS]
+_TEXT_POSITIONS = [JOB_OFFER_INSERT_COLUMNS.index('job_id')] + [
+    i for i, c in enumerate(JOB_OFFER_INSERT_COLUMNS) if c in JOB_OFFER_TEXT_COLUMNS
+]
+_COMPRESSED_POSITIONS = {i for i, c in enumerate(JOB_OFFER_INSERT_COLUMNS) if c in JOB_OFFER_COMPRESSED_COLUMNS}
+
+
+def _write_job_offers(cursor: sqlite3.Cursor, jobs_data: List[dict], upsert: bool = False) -> int:
+    """
+    Escribir ofertas en job_offers_core y job_offers_text (misma transacción)
+    Args: upsert: True pisa los campos del scraper de ofertas existentes; False las ignora
+    Returns: Filas insertadas (o actualizadas con upsert) en job_offers_core
+    """
+    values = [_job_offer_values(job_data) for job_data in jobs_data]
+    cursor.executemany(UPSERT_JOB_OFFER_CORE if upsert else INSERT_JOB_OFFER_CORE,
+                       [tuple(row[i] for i in _CORE_POSITIONS) for row in values])
+    written = cursor.rowcount
+    codec = _text_codec()
+    cursor.executemany(UPSERT_JOB_OFFER_TEXT if upsert else INSERT_JOB_OFFER_TEXT, [
+        tuple(codec.encode(row[i]) if i in _COMPRESSED_POSITIONS else row[i] for i in _TEXT_POSITIONS)
+        for row in values
+    ])
+    return written
+
+
 def insert_job_offer(job_data: dict) -> bool:
     """
     Insertar una oferta de trabajo en la tabla job_offers
@@ -155,84 +656,8 @@ def insert_job_offer(job_data: dict) -> bool:
         
         try:            
             # Mapear datos del scraper a campos de la BD
-            insert_values = (
-                job_data.get('job_id'),
-                job_data.get('source_url'),
-                job_data.get('portal_name'),
-                job_data.get('scraped_at'),
-                job_data.get('posted_date'),
-                job_data.get('job_title_raw'),
-                None,  # job_title_normalized
-                job_data.get('job_category_raw'),
-                None,  # job_role
-                job_data.get('company_name_raw'),
-                job_data.get('company_url_raw'),
-                None,  # company_type
-                job_data.get('company_description_raw'),
-                job_data.get('location_work_mode_raw'),
-                job_data.get('location_raw'),
-                None,  # country
-                None,  # city
-                job_data.get('work_mode_raw'),
-                None,  # remote_location_allowed # puede ser bool, o str
-                job_data.get('seniority_raw'),
-                None,  # seniority_normalized
-                None,  # years_experience_min
-                None,  # years_experience_max
-                job_data.get('employment_type_raw'),
-                None,  # contract_duration_months
-                job_data.get('salary_disclosed'),
-                job_data.get('salary_raw'),
-                job_data.get('salary_min_raw'),
-                job_data.get('salary_max_raw'),
-                job_data.get('salary_currency_raw'),
-                job_data.get('salary_unit_raw'),
-                job_data.get('salary_type_raw'),
-                None,  # salary_frequency
-                None,  # salary_min_clp
-                None,  # salary_max_clp
-                None,  # salary_min_usd
-                None,  # salary_max_usd
-                None,  # salary_min_market_usd
-                None,  # salary_max_market_usd
-                0,  # salary_estimated_by_llm
-                None,  # requirements_raw
-                json.dumps(job_data.get('tech_stack_raw', []), ensure_ascii=False) if job_data.get('tech_stack_raw') else None,
-                None,  # main_techs
-                None,  # skills_required
-                None,  # skills_preferred
-                None,  # english_required
-                None,  # english_level
-                None,  # job_description_raw
-                json.dumps(job_data.get('sections_raw', []), ensure_ascii=False) if job_data.get('sections_raw') else None,
-                None,  # job_summary_llm
-                None,  # responsibilities_llm
-                None,  # benefits_raw
-                None,  # benefits_parsed_llm
-                json.dumps(job_data.get('perks_raw', []), ensure_ascii=False) if job_data.get('perks_raw') else None,
-                None, # responsibilities
-                None, # requirements
-                None, # nice_to_have
-                None, # candidate_profile
-                None, # benefits
-                None, # work_conditions
-                None, # selection_process
-                None, # how_to_apply
-                None, # others
-                0,  # llm_processed
-                None,  # llm_processed_at
-                None,  # llm_confidence_score
-                None,  # processing_notes
-                1,  # is_active
-                job_data.get('last_checked', datetime.now().isoformat()),
-                job_data.get('applications_raw'),
-                None,  # application_deadline
-                job_data.get('reply_time_raw'),
-                job_data.get('remote_policy_raw'),
-                job_data.get('apply_url')
-            )
-            
-            cursor.execute(INSERT_JOB_OFFER, insert_values)
+            _write_job_offers(cursor, [job_data])
+            _after_offers_saved(cursor, [job_data])
             conn.commit()
             return True
             
@@ -243,32 +668,510 @@ def insert_job_offer(job_data: dict) -> bool:
             return False
         
 
+def upsert_job_offers(jobs_data: List[dict]) -> int:
+    """
+    Insertar o actualizar ofertas en una sola transacción. Solo se pisan los
+    campos que vienen del scraper (secciones clasificadas y LLM se conservan).
+    Args: jobs_data: Lista de diccionarios con los datos del trabajo (del scraper)
+    Returns: Número de filas insertadas o actualizadas
+    """
+    if not jobs_data:
+        return 0
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        upserted = _write_job_offers(cursor, jobs_data, upsert=True)
+        _after_offers_saved(cursor, jobs_data, replace=True)
+        conn.commit()
+        return upserted
+
+
+def save_job_offer_batch(batch: List[Tuple[dict, int]]) -> int:
+    """
+    Guardar ofertas nuevas y marcar sus URLs como procesadas en una transacción
+    Args: batch: Tuplas (datos del trabajo del scraper, id en job_urls)
+    Returns: Número de ofertas nuevas
+    """
+    jobs_data = [job_data for job_data, _ in batch]
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        inserted = _write_job_offers(cursor, jobs_data)
+        _after_offers_saved(cursor, jobs_data)
+        cursor.executemany(
+            "UPDATE job_urls SET processed = TRUE WHERE id = ?",
+            [(job_url_id,) for _, job_url_id in batch]
+        )
+        conn.commit()
+        return inserted
+
+
+class JobOfferWriter:
+    """
+    Escritor en segundo plano (write-behind) de ofertas scrapeadas.
+    Acumula ofertas en una cola y las guarda por lotes: el INSERT en job_offers
+    y el flag processed de job_urls van en la misma transacción, así que un
+    corte a mitad de lote no deja las tablas inconsistentes.
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE, flush_interval: float = WRITE_FLUSH_SECONDS,
+                 save_batch: Optional[Callable[[List[Tuple[dict, int]]], int]] = None):
+        """
+        Args: save_batch: Función que guarda un lote en una transacción y retorna
+              las ofertas nuevas (por defecto save_job_offer_batch, en SQLite)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._save_batch = save_batch or save_job_offer_batch
+        self.inserted = 0   # Ofertas nuevas en job_offers
+        self.marked = 0     # URLs marcadas como procesadas
+        self.errors = 0     # Ofertas en lotes que fallaron
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="job-offer-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job_data: dict, job_url_id: int):
+        """
+        Encolar una oferta para guardar (no bloquea)
+        Args:
+            job_data: Diccionario con los datos del trabajo (del scraper)
+            job_url_id: id en job_urls a marcar como procesado
+        """
+        self._queue.put((job_data, job_url_id))
+
+    def close(self):
+        """Guardar lo pendiente y detener el hilo escritor"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _worker(self):
+        batch = []
+        deadline = None
+        running = True
+        while running:
+            timeout = max(0.0, deadline - time.monotonic()) if deadline else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False  # Venció el intervalo de flush
+
+            if item is None:
+                running = False
+            elif item:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            if batch and (not running or item is False or len(batch) >= self.batch_size):
+                self._flush(batch)
+                batch = []
+                deadline = None
+
+    def _flush(self, batch: list):
+        """Guardar un lote de ofertas y marcar sus URLs en una transacción"""
+        try:
+            inserted = self._save_batch(batch)
+        except Exception as e:  # sqlite3.Error, psycopg.Error...: el hilo escritor no debe morir
+            self.errors += len(batch)
+            print(f"✗ Error guardando lote de {len(batch)} ofertas: {e}")
+            return
+
+        self.inserted += inserted
+        self.marked += len(batch)
+        print(f"✓ Lote guardado: {inserted} nuevas de {len(batch)} ofertas")
+
+
+def backfill_job_technologies(chunk_size: int = READ_CHUNK_SIZE) -> int:
+    """
+    Reconstruir job_technologies desde tech_stack_raw de todas las ofertas
+    (una transacción por página de chunk_size ofertas)
+    Returns: Número de ofertas procesadas
+    """
+    processed = 0
+    techs_by_offer = {}
+
+    def flush():
+        with get_db_connection() as conn:
+            _link_technologies(conn.cursor(), techs_by_offer, replace=True)
+            conn.commit()
+        techs_by_offer.clear()
+
+    for row in _iter_keyset("job_offers", "tech_stack_raw", "tech_stack_raw IS NOT NULL", chunk_size=chunk_size):
+        try:
+            techs_by_offer[row['id']] = json.loads(row['tech_stack_raw'])
+        except json.JSONDecodeError:
+            print(f"Error parseando tech_stack_raw para la oferta id: {row['id']}")
+            continue
+        processed += 1
+        if len(techs_by_offer) >= chunk_size:
+            flush()
+
+    if techs_by_offer:
+        flush()
+    return processed
+
+
+def get_top_technologies(limit: int = 20, since: Optional[str] = None) -> List[Tuple[str, int]]:
+    """
+    Tecnologías más pedidas
+    Args:
+        limit: Cantidad de tecnologías a retornar
+        since: Solo ofertas publicadas desde esta fecha (YYYY-MM-DD)
+    Returns: Lista de (nombre, cantidad de ofertas)
+    """
+    with get_db_connection() as conn:
+        if since:
+            return conn.execute("""
+                SELECT t.name, COUNT(*) AS count
+                FROM job_offers_core o
+                JOIN job_technologies jt ON jt.job_offer_id = o.id
+                JOIN technologies t ON t.id = jt.technology_id
+                WHERE o.posted_date >= ?
+                GROUP BY t.id
+                ORDER BY count DESC
+                LIMIT ?
+            """, (since, limit)).fetchall()
+        return conn.execute("""
+            SELECT t.name, COUNT(*) AS count
+            FROM job_technologies jt
+            JOIN technologies t ON t.id = jt.technology_id
+            GROUP BY jt.technology_id
+            ORDER BY count DESC
+            LIMIT ?
+        """, (limit,)).fetchall()
+
+
+def get_offers_with_technologies(names: List[str], limit: int = 100) -> List[sqlite3.Row]:
+    """
+    Ofertas que piden todas las tecnologías indicadas (ej: ['Kubernetes', 'Go'])
+    Returns: Filas con id, job_id, título, empresa, fecha y URL, más recientes primero
+    """
+    keys = list({_technology_key(name) for name in names})
+    if not keys:
+        return []
+    with get_db_connection() as conn:
+        return conn.execute(f"""
+            SELECT o.id, o.job_id, o.job_title_raw, o.company_name_raw, o.posted_date, o.source_url
+            FROM job_offers_core o
+            WHERE o.id IN (
+                SELECT jt.job_offer_id
+                FROM technologies t
+                JOIN job_technologies jt ON jt.technology_id = t.id
+                WHERE t.name_key IN ({','.join('?' * len(keys))})
+                GROUP BY jt.job_offer_id
+                HAVING COUNT(*) = ?
+            )
+            ORDER BY o.posted_date DESC
+            LIMIT ?
+        """, (*keys, len(keys), limit)).fetchall()
+
+
+def rebuild_search_index() -> int:
+    """
+    Reconstruir job_offers_fts completo desde job_offers
+    Returns: Número de ofertas indexadas
+    """
+    columns = ', '.join(JOB_OFFERS_FTS_COLUMNS)
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM job_offers_fts")
+        cursor.execute(f"INSERT INTO job_offers_fts (rowid, {columns}) SELECT id, {_FTS_SOURCE_COLUMNS} FROM job_offers")
+        indexed = cursor.rowcount
+        cursor.execute("INSERT INTO job_offers_fts (job_offers_fts) VALUES ('optimize')")
+        conn.commit()
+        return indexed
+
+
+def _fts_query(query: str, match_all: bool = True, prefix: bool = True) -> str:
+    """
+    Convertir texto libre en una consulta FTS5 segura: normalizado como
+    normalize_text y cada término entre comillas (sin operadores del usuario)
+    """
+    terms = normalize_text(query).replace('-', ' ').replace("'", ' ').split()
+    suffix = '*' if prefix else ''
+    return (' ' if match_all else ' OR ').join(f'"{term}"{suffix}' for term in terms)
+
+
+def search_job_offers(query: str, limit: int = 20, match_all: bool = True, prefix: bool = True) -> List[sqlite3.Row]:
+    """
+    Búsqueda full-text en ofertas y secciones clasificadas
+    Args:
+        query: Texto libre (ej: 'kubernetes golang remoto')
+        limit: Máximo de resultados
+        match_all: True = todas las palabras (AND), False = cualquiera (OR)
+        prefix: Buscar también palabras que empiezan con cada término
+    Returns: Filas con id, job_id, título, empresa, fecha, URL, rank (bm25, menor = mejor) y snippet
+    """
+    fts_query = _fts_query(query, match_all, prefix)
+    if not fts_query:
+        return []
+    weights = ', '.join(str(weight) for weight in JOB_OFFERS_FTS_WEIGHTS.values())
+    with get_db_connection() as conn:
+        return conn.execute(f"""
+            SELECT o.id, o.job_id, o.job_title_raw, o.company_name_raw, o.posted_date, o.source_url,
+                   bm25(job_offers_fts, {weights}) AS rank,
+                   snippet(job_offers_fts, -1, '[', ']', '…', 16) AS snippet
+            FROM job_offers_fts
+            JOIN job_offers_core o ON o.id = job_offers_fts.rowid
+            WHERE job_offers_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, (fts_query, limit)).fetchall()
+
+
+def train_text_compression_dictionary(max_samples: int = TEXT_COMPRESSION_DICT_SAMPLES) -> Optional[int]:
+    """
+    Entrenar un diccionario zstd con los textos de las ofertas más recientes,
+    guardarlo en text_compression_dictionaries y dejarlo como el vigente
+    Returns: id del diccionario, o None si no se pudo entrenar
+    """
+    codec = _text_codec()
+    columns = ', '.join(JOB_OFFER_COMPRESSED_COLUMNS)
+    samples = []
+    for row in _iter_keyset("job_offers", columns, descending=True):
+        samples.extend(codec.decode(row[column]) for column in JOB_OFFER_COMPRESSED_COLUMNS if row[column])
+        if len(samples) >= max_samples:
+            break
+    samples = samples[:max_samples]
+
+    data = train_dictionary(samples, TEXT_COMPRESSION_DICT_SIZE)
+    if data is None:
+        return None
+    with get_db_connection() as conn:
+        cursor = conn.execute(
+            "INSERT INTO text_compression_dictionaries (algorithm, dictionary, samples) VALUES ('zstd', ?, ?)",
+            (data, len(samples))
+        )
+        conn.commit()
+    codec.add_dictionary(cursor.lastrowid, data)
+    print(f"✓ Diccionario zstd {cursor.lastrowid} entrenado con {len(samples)} textos ({len(data):,} bytes)")
+    return cursor.lastrowid
+
+
+def _stored_size(value) -> int:
+    if value is None:
+        return 0
+    return len(value) if isinstance(value, bytes) else len(value.encode('utf-8'))
+
+
+def recompress_job_offers_text(train: bool = True, vacuum: bool = True,
+                               chunk_size: int = READ_CHUNK_SIZE) -> Tuple[int, int, int]:
+    """
+    Reescribir las columnas de JOB_OFFER_COMPRESSED_COLUMNS de las ofertas ya
+    guardadas según TEXT_COMPRESSION: comprime las que están en texto plano,
+    recomprime con el diccionario vigente o descomprime si está desactivada.
+    Idempotente: las filas que ya están en el formato vigente no se tocan
+    Args:
+        train: Con zstd, entrenar antes un diccionario con las ofertas guardadas
+        vacuum: Ejecutar VACUUM al final para devolver el espacio liberado al disco
+    Returns: (ofertas reescritas, bytes antes, bytes después) de esas columnas
+    """
+    codec = _text_codec()
+    if train and codec.algorithm == 'zstd':
+        train_text_compression_dictionary()
+
+    rewritten = before = after = 0
+    pending = []
+
+    def flush():
+        with get_db_connection() as conn:
+            conn.executemany(f"""
+                UPDATE job_offers_text
+                SET {', '.join(f'{column} = ?' for column in JOB_OFFER_COMPRESSED_COLUMNS)}
+                WHERE job_id = ?
+            """, pending)
+            conn.commit()
+        pending.clear()
+
+    columns = ', '.join(JOB_OFFER_COMPRESSED_COLUMNS)
+    for row in _iter_keyset("job_offers", f"job_id, {columns}", chunk_size=chunk_size):
+        stored = [row[column] for column in JOB_OFFER_COMPRESSED_COLUMNS]
+        encoded = [codec.encode(codec.decode(value)) for value in stored]
+        before += sum(_stored_size(value) for value in stored)
+        after += sum(_stored_size(value) for value in encoded)
+        if encoded != stored:
+            pending.append((*encoded, row['job_id']))
+            rewritten += 1
+        if len(pending) >= chunk_size:
+            flush()
+    if pending:
+        flush()
+
+    if vacuum and rewritten:
+        with get_db_connection() as conn:
+            conn.execute("VACUUM")
+    return rewritten, before, after
+
+
+def get_archived_detail_pages(urls: Optional[List[str]] = None) -> List[Tuple[str, str, str, str]]:
+    """
+    Obtener la última versión archivada de cada página de detalle
+    Args: urls: URLs de detalle a considerar (None = las registradas en job_urls de esta BD;
+          con otro backend de almacenamiento se pasan las suyas)
+    Returns: Lista de tuplas (url, content_hash, compression, fetched_at)
+    """
+    condition = "WHERE r.url IN (SELECT url FROM job_urls)" if urls is None else ""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT r.url, r.content_hash, r.compression, r.fetched_at
+            FROM raw_pages r
+            JOIN (SELECT MAX(id) AS id FROM raw_pages GROUP BY url) latest ON latest.id = r.id
+            {condition}
+            ORDER BY r.id
+        """)
+        pages = [tuple(row) for row in cursor.fetchall()]
+    if urls is not None:
+        urls = set(urls)
+        pages = [page for page in pages if page[0] in urls]
+    return pages
+
+
+def _iter_sections(where: str, params: tuple = (), chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """Recorrer ofertas por keyset decodificando sections_raw de a una"""
+    for row in _iter_keyset("job_offers", "job_id, sections_raw, sections_hash", where, params,
+                            chunk_size=chunk_size):
+        sections_raw = _text_codec().decode(row['sections_raw'])
+        try:
+            sections = json.loads(sections_raw) if sections_raw else []
+        except json.JSONDecodeError:
+            print(f"Error parseando sections_raw para job_id: {row['job_id']}")
+            continue
+        yield {
+            'job_id': row['job_id'],
+            'sections': sections,
+            # Ofertas guardadas antes de existir la columna: se calcula aquí
+            'sections_hash': row['sections_hash'] or sections_hash(sections_raw)
+        }
+
+
+def iter_jobs_sections_raw(chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Iterar job_id y sections_raw de las ofertas, decodificando el JSON de a una
+    Yields: Diccionarios con job_id, sections_raw parseado y sections_hash
+    """
+    return _iter_sections("sections_raw IS NOT NULL", chunk_size=chunk_size)
+
+
+# Ofertas sin clasificar o clasificadas con otro contenido u otra versión del clasificador
+_PENDING_CLASSIFICATION = """
+    sections_raw IS NOT NULL AND (
+        classifier_version IS NOT ?
+        OR sections_hash IS NULL
+        OR classified_sections_hash IS NOT sections_hash
+    )
+"""
+
+
+def iter_jobs_to_classify(classifier_version: str, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+    """
+    Iterar solo las ofertas cuya clasificación falta o está obsoleta
+    Args: classifier_version: Versión actual del clasificador (patrones + parámetros)
+    Yields: Diccionarios con job_id, sections_raw parseado y sections_hash
+    """
+    return _iter_sections(_PENDING_CLASSIFICATION, (classifier_version,), chunk_size)
+
+
+def count_jobs_to_classify(classifier_version: str) -> int:
+    """Contar ofertas cuya clasificación falta o está obsoleta"""
+    with get_db_connection() as conn:
+        return conn.execute(
+            f"SELECT COUNT(*) FROM job_offers WHERE {_PENDING_CLASSIFICATION}", (classifier_version,)
+        ).fetchone()[0]
+
+
+def count_jobs_with_sections() -> int:
+    """Contar ofertas que tienen sections_raw"""
+    with get_db_connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM job_offers WHERE sections_raw IS NOT NULL"
+        ).fetchone()[0]
+
+
 def get_jobs_sections_raw() -> List[dict]:
     """
     Obtener job_id y sections_raw de todas las ofertas
     Returns: Lista de diccionarios con job_id y sections_raw parseado
+    (para tablas grandes usar iter_jobs_sections_raw)
     """
+    return list(iter_jobs_sections_raw())
+
+
+def update_job_sections_batch(jobs: List[Tuple[str, str, dict]], classifier_version: str) -> int:
+    """
+    Guardar la clasificación de varias ofertas en una sola transacción
+    Args:
+        jobs: Tuplas (job_id, sections_hash, secciones clasificadas)
+        classifier_version: Versión del clasificador que produjo el resultado
+    Returns: Número de ofertas actualizadas
+    """
+    if not jobs:
+        return 0
+
+    columns = ['responsibilities', 'requirements', 'nice_to_have', 'candidate_profile', 'benefits',
+               'work_conditions', 'selection_process', 'how_to_apply', 'others']
+    rows = [
+        (*(_encode_text(column, classified.get(column)) for column in columns),
+         hash_value, hash_value, classifier_version, job_id)
+        for job_id, hash_value, classified in jobs
+    ]
     with get_db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("""
-            SELECT job_id, sections_raw 
-            FROM job_offers 
-            WHERE sections_raw IS NOT NULL
-        """)
-        
-        results = []
-        for row in cursor.fetchall():
-            try:
-                sections = json.loads(row['sections_raw']) if row['sections_raw'] else []
-                results.append({
-                    'job_id': row['job_id'],
-                    'sections': sections
-                })
-            except json.JSONDecodeError:
-                print(f"Error parseando sections_raw para job_id: {row['job_id']}")
-                continue
-                
-        return results
+        # Textos en job_offers_text, estado de clasificación en job_offers_core
+        cursor.executemany(f"""
+            UPDATE job_offers_text 
+            SET {', '.join(f'{column} = ?' for column in columns)}
+            WHERE job_id = ?
+        """, [(*row[:len(columns)], row[-1]) for row in rows])
+        cursor.executemany("""
+            UPDATE job_offers_core 
+            SET sections_hash = ?,
+                classified_sections_hash = ?,
+                classifier_version = ?
+            WHERE job_id = ?
+        """, [row[len(columns):] for row in rows])
+        updated = cursor.rowcount
+        _sync_search_index(cursor, list(_offer_ids(cursor, [job_id for job_id, _, _ in jobs]).values()))
+        conn.commit()
+        return updated
+
+
+def load_section_title_cache(patterns_hash: str) -> dict:
+    """
+    Leer la cache persistente de títulos para la versión vigente del clasificador
+    y eliminar las entradas de versiones anteriores
+    Args: patterns_hash: Versión del clasificador (SectionClassifier.version)
+    Returns: Diccionario título normalizado -> categoría
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM section_title_cache WHERE patterns_hash != ?", (patterns_hash,))
+        if cursor.rowcount:
+            print(f"Cache de títulos: {cursor.rowcount} entradas obsoletas eliminadas")
+        conn.commit()
+        cursor.execute(
+            "SELECT title_norm, category FROM section_title_cache WHERE patterns_hash = ?",
+            (patterns_hash,)
+        )
+        return {row['title_norm']: row['category'] for row in cursor}
+
+
+def save_section_title_cache(entries: dict, patterns_hash: str) -> int:
+    """
+    Guardar clasificaciones de títulos en la cache persistente
+    Args:
+        entries: Diccionario título normalizado -> categoría
+        patterns_hash: Versión del clasificador que las calculó
+    Returns: Número de entradas guardadas
+    """
+    if not entries:
+        return 0
+    with get_db_connection() as conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO section_title_cache (title_norm, patterns_hash, category) VALUES (?, ?, ?)",
+            [(title_norm, patterns_hash, category) for title_norm, category in entries.items()]
+        )
+        conn.commit()
+    return len(entries)
 
 
 def update_job_sections(job_id: str, classified_sections: dict) -> bool:
@@ -284,7 +1187,7 @@ def update_job_sections(job_id: str, classified_sections: dict) -> bool:
         
         try:
             cursor.execute("""
-                UPDATE job_offers 
+                UPDATE job_offers_text 
                 SET 
                     responsibilities = ?,
                     requirements = ?,
@@ -297,20 +1200,22 @@ def update_job_sections(job_id: str, classified_sections: dict) -> bool:
                     others = ?
                 WHERE job_id = ?
             """, (
-                classified_sections.get('responsibilities'),
-                classified_sections.get('requirements'),
-                classified_sections.get('nice_to_have'),
-                classified_sections.get('candidate_profile'),
-                classified_sections.get('benefits'),
-                classified_sections.get('work_conditions'),
-                classified_sections.get('selection_process'),
-                classified_sections.get('how_to_apply'),
-                classified_sections.get('others'),
+                _encode_text('responsibilities', classified_sections.get('responsibilities')),
+                _encode_text('requirements', classified_sections.get('requirements')),
+                _encode_text('nice_to_have', classified_sections.get('nice_to_have')),
+                _encode_text('candidate_profile', classified_sections.get('candidate_profile')),
+                _encode_text('benefits', classified_sections.get('benefits')),
+                _encode_text('work_conditions', classified_sections.get('work_conditions')),
+                _encode_text('selection_process', classified_sections.get('selection_process')),
+                _encode_text('how_to_apply', classified_sections.get('how_to_apply')),
+                _encode_text('others', classified_sections.get('others')),
                 job_id
             ))
+            updated = cursor.rowcount > 0
+            _sync_search_index(cursor, list(_offer_ids(cursor, [job_id]).values()))
             
             conn.commit()
-            return cursor.rowcount > 0
+            return updated
             
         except Exception as e:
             print(f"Error actualizando secciones para job_id {job_id}: {e}")
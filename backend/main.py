@@ -5,16 +5,31 @@ JobRadar Chile - Script principal
 Orquesta el proceso de scraping y almacenamiento
 """
 
+import os
+import re
 import sys
 import time
 from datetime import datetime
-import random
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from scrapers.getonbrd import GetOnBoardScraper
-from config import GETONBOARD_CATEGORIES
-from database import create_tables, insert_job_urls, get_job_count_by_portal
-from database import get_job_urls_full, insert_job_offer, mark_job_as_processed
-from database import get_jobs_sections_raw, update_job_sections
-from utils.section_classifier import section_classifier
+from config import GETONBOARD_CATEGORIES, DETAIL_CRAWL_WORKERS, LISTING_SWEEP_WORKERS
+from config import RAW_ARCHIVE_PATH, REPARSE_BATCH_SIZE, CLASSIFY_BATCH_SIZE, SECTION_CACHE_PERSIST
+from config import STORAGE_BACKEND
+from database import create_tables, get_archived_detail_pages
+from database import close_db_connections, JobOfferWriter
+from database import count_jobs_with_sections, iter_jobs_to_classify, count_jobs_to_classify
+from database import iter_jobs_sections_raw
+from database import update_job_sections_batch, load_section_title_cache, save_section_title_cache
+from database import backfill_job_technologies
+from database import recompress_job_offers_text
+from utils.section_classifier import section_classifier, classify_titles, classify_content, get_section_classifier
+from utils.section_classifier import _section_classifier_reference
+from utils.raw_archive import read_blob
+from storage import get_storage, close_storages
+
+# Scraper sin red de cada proceso del pool de re-parseo
+_reparse_scraper = None
 
 def scrape_getonboard(categories: list = None):
     """
@@ -25,6 +40,11 @@ def scrape_getonboard(categories: list = None):
         categories = ['programming']
     
     scraper = GetOnBoardScraper()
+    storage = get_storage()
+
+    # URLs ya guardadas: permiten cortar la paginación apenas todo es conocido
+    known_urls = set(storage.get_all_urls())
+    print(f"URLs conocidas en la BD: {len(known_urls)}")
     
     for category in categories:
         print(f"\n{'='*50}")
@@ -32,68 +52,142 @@ def scrape_getonboard(categories: list = None):
         print(f"{'='*50}")
         
         # Obtener trabajos
-        jobs = scraper.scrape_job_listings(category)
+        jobs = scraper.scrape_job_listings(category, known_urls=known_urls)
         
         if jobs:
             # Guardar en base de datos
-            inserted = insert_job_urls(
-                jobs_data=jobs,
-                portal=scraper.portal_name,
-                category=category
+            inserted = storage.insert_job_urls(
+                [(url, posted_date, category) for url, posted_date in jobs],
+                portal=scraper.portal_name
             )
             print(f"✓ Categoría {category} completada: {inserted} nuevos trabajos")
         else:
             print(f"✗ No se encontraron trabajos para {category}")
 
+    scraper.close()
+
+
+def sweep_getonboard(categories: list = None, workers: int = LISTING_SWEEP_WORKERS):
+    """
+    Barrer los listados de todas las categorías en paralelo. El throttle del
+    scraper aplica el límite global de requests; las URLs se combinan en
+    memoria y se guardan en una sola transacción.
+    Args:
+        categories: Lista de categorías. Si es None, usa GETONBOARD_CATEGORIES
+        workers: Categorías recorridas a la vez
+    """
+    if categories is None:
+        categories = GETONBOARD_CATEGORIES
+
+    print(f"\n{'='*50}")
+    print(f"BARRIDO DE {len(categories)} CATEGORÍAS ({workers} workers)")
+    print(f"{'='*50}")
+
+    scraper = GetOnBoardScraper()
+    storage = get_storage()
+    known_urls = set(storage.get_all_urls())
+    print(f"URLs conocidas en la BD: {len(known_urls)}")
+
+    def crawl_category(category: str) -> tuple:
+        start = time.perf_counter()
+        jobs = scraper.scrape_job_listings(category, known_urls=known_urls)
+        return category, jobs, time.perf_counter() - start
+
+    sweep_start = time.perf_counter()
+    merged = {}         # url -> (url, posted_date, category); gana la primera categoría
+    category_stats = []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(crawl_category, category) for category in categories]
+        for future in as_completed(futures):
+            category, jobs, elapsed = future.result()
+            for url, posted_date in jobs:
+                merged.setdefault(url, (url, posted_date, category))
+            category_stats.append((category, len(jobs), elapsed))
+
+    scraper.close()
+    inserted = storage.insert_job_urls(list(merged.values()), portal=scraper.portal_name)
 
-def scrape_job_details(limit: int = None, test_mode: bool = False):
+    # Resumen por categoría
+    print(f"\n{'Categoría':<28}{'URLs':>6}{'Tiempo':>10}")
+    for category, count, elapsed in sorted(category_stats):
+        print(f"{category:<28}{count:>6}{elapsed:>9.1f}s")
+    print(f"✓ Barrido completado en {time.perf_counter() - sweep_start:.1f}s: "
+          f"{len(merged)} URLs únicas, {inserted} nuevas en la BD")
+
+
+def scrape_job_details(limit: int = None, test_mode: bool = False, concurrent: bool = False):
     """
     Scrapear detalles de cada oferta de trabajo desde las URLs guardadas
     Args:
         limit: Número máximo de URLs a procesar (None = todas)
         test_mode: Si True, solo procesa 3 URLs para testing
+        concurrent: Si True, mantiene DETAIL_CRAWL_WORKERS requests en vuelo
     """
     print(f"\n{'='*50}")
     print("SCRAPING DETALLES DE OFERTAS")
     print(f"{'='*50}")
     
-    # Obtener URLs no procesadas
-    job_urls = get_job_urls_full(processed=False, limit=limit)
+    storage = get_storage()
+
+    # Obtener URLs no procesadas (se leen por páginas a medida que avanzan)
+    total_urls = storage.count_job_urls(processed=False)
+    if limit:
+        total_urls = min(total_urls, limit)
     
-    if not job_urls:
+    if not total_urls:
         print("No hay URLs pendientes de procesar")
         return
     
-    total_urls = len(job_urls)
     print(f"URLs a procesar: {total_urls}")
     
     if test_mode:
-        job_urls = job_urls[:3]
+        total_urls = min(total_urls, 3)
         print("Modo TEST: procesando solo 3 URLs")
+
+    # Con varios hosts, cada uno reserva sus URLs y no repite las de los demás
+    job_urls = storage.claim_job_urls(total_urls)
     
     scraper = GetOnBoardScraper()
-    processed = 0
+    writer = storage.job_offer_writer()
+
+    if concurrent:
+        errors = scrape_job_details_concurrent(scraper, writer, job_urls, total_urls)
+    else:
+        errors = scrape_job_details_serial(scraper, writer, job_urls, total_urls)
+
+    scraper.close()
+    writer.close()  # Espera a que se guarde el último lote
+    
+    # Resumen
+    print(f"\n{'='*50}")
+    print(f"RESUMEN SCRAPING DETALLES")
+    print(f"{'='*50}")
+    print(f"Total procesados: {writer.inserted}/{total_urls}")
+    print(f"Errores: {errors + writer.errors}")
+    print(f"✓ Scraping de detalles completado")
+
+
+def scrape_job_details_serial(scraper: GetOnBoardScraper, writer: JobOfferWriter, job_urls, total: int) -> int:
+    """
+    Procesar las URLs una a una. El ritmo lo controla el rate limiter
+    adaptativo del scraper (sin pausas fijas)
+    Returns: Número de errores
+    """
     errors = 0
     
     for idx, job_url_row in enumerate(job_urls, 1):
         url = job_url_row['url']
-        job_id = job_url_row['id']
         
-        print(f"\n[{idx}/{len(job_urls)}] Procesando: {url}")
+        print(f"\n[{idx}/{total}] Procesando: {url}")
         
         try:
             # Scrapear detalles
             job_details = scraper.scrape_job_detail(url)
             
             if job_details:
-                # Insertar en job_offers
-                if insert_job_offer(job_details):
-                    print(f"✓ Guardado en job_offers")
-                    mark_job_as_processed(job_id)
-                    processed += 1
-                else:
-                    print(f"⚠ Ya existe en job_offers")
-                    mark_job_as_processed(job_id)  # Marcar como procesado igual
+                # Encolar para job_offers (se guarda por lotes)
+                writer.submit(job_details, job_url_row['id'])
             else:
                 print(f"✗ No se pudieron obtener detalles")
                 errors += 1
@@ -101,26 +195,191 @@ def scrape_job_details(limit: int = None, test_mode: bool = False):
         except Exception as e:
             print(f"✗ Error: {e}")
             errors += 1
-        
-        # Delay entre requests
-        if idx < len(job_urls):  # No delay después del último
-            delay = random.uniform(1, 3)
-            print(f"Esperando {delay:.1f} segundos...")
-            time.sleep(delay)
-            
-            # Pausa larga cada 50 registros
-            if idx % 50 == 0:
-                long_delay = random.uniform(10, 20)
-                print(f"\n⏸ Pausa larga: {long_delay:.1f} segundos (cada 50 registros)")
-                time.sleep(long_delay)
-    
-    # Resumen
+
+    return errors
+
+
+def scrape_job_details_concurrent(scraper: GetOnBoardScraper, writer: JobOfferWriter, job_urls, total: int,
+                                  workers: int = DETAIL_CRAWL_WORKERS) -> int:
+    """
+    Procesar las URLs con un pool de hilos. El ritmo lo controla el throttle
+    del scraper (tope por host y rate limiter adaptativo); el fetch y el
+    parseo corren en los hilos y el writer guarda por lotes en segundo plano.
+    Solo se mantienen 2 x workers URLs en vuelo, así job_urls se consume de a poco.
+    Returns: Número de errores
+    """
+    errors = 0
+    done = 0
+    job_urls = iter(job_urls)
+    print(f"Modo concurrente: {workers} workers")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def submit_next(count: int):
+            for job_url_row in islice(job_urls, count):
+                pending[executor.submit(scraper.scrape_job_detail, job_url_row['url'])] = job_url_row
+
+        submit_next(2 * workers)
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job_url_row = pending.pop(future)
+                done += 1
+                print(f"\n[{done}/{total}] Resultado: {job_url_row['url']}")
+
+                try:
+                    job_details = future.result()
+
+                    if job_details:
+                        writer.submit(job_details, job_url_row['id'])
+                    else:
+                        print(f"✗ No se pudieron obtener detalles")
+                        errors += 1
+
+                except Exception as e:
+                    print(f"✗ Error: {e}")
+                    errors += 1
+
+            submit_next(len(finished))
+
+    return errors
+
+
+def check_parser_parity() -> int:
+    """
+    Verificar que los motores 'bs4' y 'lxml' extraen lo mismo sobre las
+    páginas de detalle guardadas en la cache HTTP
+    Returns: Número de páginas con diferencias
+    """
     print(f"\n{'='*50}")
-    print(f"RESUMEN SCRAPING DETALLES")
+    print("PARIDAD DE MOTORES DE PARSEO")
     print(f"{'='*50}")
-    print(f"Total procesados: {processed}/{total_urls}")
-    print(f"Errores: {errors}")
-    print(f"✓ Scraping de detalles completado")
+
+    scraper = GetOnBoardScraper()
+    if not scraper.cache:
+        print("La cache HTTP está deshabilitada, no hay páginas guardadas")
+        return 0
+
+    checked = 0
+    mismatches = 0
+    for meta in scraper.cache.iter_entries():
+        # Solo páginas de detalle: /jobs/<categoria>/<slug>
+        if not re.search(r'/(?:jobs|empleos|empregos|emplois)/[^/]+/[^/?]+', meta['url']):
+            continue
+        content = scraper.cache.load_body(meta['url'])
+        if content is None:
+            continue
+
+        checked += 1
+        diff = scraper.diff_parser_engines(content)
+        if diff:
+            mismatches += 1
+            print(f"✗ {meta['url']}")
+            for key, (bs4_value, lxml_value) in diff.items():
+                print(f"    {key}: bs4={bs4_value!r} lxml={lxml_value!r}")
+
+    scraper.close()
+    print(f"Páginas comparadas: {checked}, con diferencias: {mismatches}")
+    return mismatches
+
+
+def check_classifier_parity() -> int:
+    """
+    Verificar que SectionClassifier clasifica igual que la implementación
+    original sobre los títulos de sección guardados en job_offers
+    Returns: Número de títulos con diferencias
+    """
+    print(f"\n{'='*50}")
+    print("PARIDAD DEL CLASIFICADOR DE SECCIONES")
+    print(f"{'='*50}")
+
+    titles = {
+        section.get('title', '')
+        for job in iter_jobs_sections_raw()
+        for section in job['sections']
+    }
+
+    mismatches = 0
+    for title in sorted(titles):
+        expected = _section_classifier_reference(title)
+        result = section_classifier(title)
+        if result != expected:
+            mismatches += 1
+            print(f"✗ {title!r}: original={expected} nuevo={result}")
+
+    print(f"Títulos comparados: {len(titles)}, con diferencias: {mismatches}")
+    return mismatches
+
+
+def _init_reparse_worker():
+    """Crear el scraper offline una vez por proceso"""
+    global _reparse_scraper
+    _reparse_scraper = GetOnBoardScraper(offline=True)
+
+
+def _reparse_page(page: tuple):
+    """
+    Re-parsear una página archivada (corre en un proceso del pool)
+    Args: page: Tupla (url, content_hash, compression, fetched_at)
+    Returns: Diccionario del detalle o None
+    """
+    url, content_hash, compression, fetched_at = page
+    try:
+        content = read_blob(RAW_ARCHIVE_PATH, content_hash, compression)
+        job_detail = _reparse_scraper.parse_job_detail(content, url, check_age=False)
+    except Exception as e:
+        print(f"✗ Error re-parseando {url}: {e}")
+        return None
+
+    if job_detail:
+        job_detail['scraped_at'] = fetched_at  # Fecha real de la descarga
+    return job_detail
+
+
+def reparse_archived_pages(workers: int = None, batch_size: int = REPARSE_BATCH_SIZE) -> int:
+    """
+    Re-parsear todas las páginas de detalle archivadas, sin tráfico de red,
+    y actualizar job_offers por lotes
+    Args:
+        workers: Procesos del pool (None = uno por core)
+        batch_size: Ofertas por transacción
+    Returns: Número de ofertas insertadas o actualizadas
+    """
+    print(f"\n{'='*50}")
+    print("RE-PARSEO DEL ARCHIVO HTML")
+    print(f"{'='*50}")
+
+    storage = get_storage()
+    # Con SQLite las URLs se cruzan en la misma BD; con otro backend se le piden a él
+    pages = get_archived_detail_pages(None if STORAGE_BACKEND == 'sqlite' else storage.get_all_urls())
+    if not pages:
+        print("No hay páginas de detalle archivadas")
+        return 0
+
+    workers = workers or os.cpu_count()
+    print(f"Páginas a re-parsear: {len(pages)} ({workers} procesos)")
+
+    start = time.perf_counter()
+    upserted = 0
+    discarded = 0
+    batch = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_reparse_worker) as executor:
+        for job_detail in executor.map(_reparse_page, pages, chunksize=16):
+            if not job_detail:
+                discarded += 1
+                continue
+            batch.append(job_detail)
+            if len(batch) >= batch_size:
+                upserted += storage.upsert_job_offers(batch)
+                batch = []
+
+    upserted += storage.upsert_job_offers(batch)
+
+    print(f"✓ Re-parseo completado en {time.perf_counter() - start:.1f}s: "
+          f"{upserted} ofertas actualizadas, {discarded} descartadas")
+    return upserted
 
 
 def show_stats():
@@ -129,56 +388,136 @@ def show_stats():
     print("ESTADÍSTICAS")
     print(f"{'='*50}")
     
-    stats = get_job_count_by_portal()
+    storage = get_storage()
+    stats = storage.get_job_count_by_portal()
     for portal, count in stats:
         print(f"{portal}: {count} trabajos")
 
+    top_technologies = storage.get_top_technologies(limit=10)
+    if top_technologies:
+        print("Tecnologías más pedidas: " + ", ".join(f"{name} ({count})" for name, count in top_technologies))
+
+
+def backfill_technologies():
+    """Poblar technologies / job_technologies para las ofertas ya guardadas"""
+    print(f"\n{'='*50}")
+    print("BACKFILL DE TECNOLOGÍAS")
+    print(f"{'='*50}")
+
+    start = time.perf_counter()
+    processed = backfill_job_technologies()
+    print(f"✓ {processed} ofertas enlazadas en {time.perf_counter() - start:.1f}s")
+    return processed
 
-def process_all_sections():
-    """Procesar y clasificar todas las secciones de las ofertas"""
+
+def compress_text_columns():
+    """Llevar los textos de las ofertas ya guardadas al formato de TEXT_COMPRESSION"""
+    print(f"\n{'='*50}")
+    print("COMPRESIÓN DE TEXTOS")
+    print(f"{'='*50}")
+
+    start = time.perf_counter()
+    rewritten, before, after = recompress_job_offers_text()
+    ratio = before / after if after else 1.0
+    print(f"✓ {rewritten} ofertas reescritas en {time.perf_counter() - start:.1f}s")
+    print(f"Textos: {before:,} -> {after:,} bytes ({ratio:.1f}x)")
+    return rewritten
+
+
+def classify_sections(sections: list, categories: list = None) -> dict:
+    """
+    Clasificar las secciones de una oferta por su título
+    Args:
+        sections: Secciones de sections_raw (title, content)
+        categories: Categorías ya calculadas por título (None = clasificar aquí)
+    """
+    if categories is None:
+        categories = classify_titles([section.get('title', '') for section in sections])
+
+    classified = {}
+    
+    for section, category in zip(sections, categories):
+        title = section.get('title', '')
+        content = section.get('content', '')
+
+        # Segunda etapa: si el título no calza, clasificar por el contenido
+        if not category:
+            category = classify_content(content)
+        
+        if category:
+            # Si ya existe esta categoría, concatenar
+            if category in classified:
+                classified[category] += f"\n\n{content}"
+            else:
+                classified[category] = content
+        else:
+            # Agregar a "others" si no se pudo clasificar
+            if 'others' not in classified:
+                classified['others'] = ""
+            classified['others'] += f"\n\n[{title}]\n{content}"
+
+    return classified
+
+
+def process_all_sections(batch_size: int = CLASSIFY_BATCH_SIZE):
+    """
+    Clasificar las secciones de las ofertas nuevas o con clasificación obsoleta
+    (sections_raw cambió o cambiaron SECTION_PATTERNS / el clasificador)
+    """
 
     print("\n" + "="*50)
     print("CLASIFICACIÓN DE SECCIONES")
     print("="*50)
 
-    # Obtener todas las ofertas con sections_raw
-    jobs_data = get_jobs_sections_raw()
-    print(f"Procesando {len(jobs_data)} ofertas con secciones...")
+    classifier = get_section_classifier()
+    version = classifier.version
+    pending = count_jobs_to_classify(version)
+    if not pending:
+        print("Todas las ofertas están clasificadas con la versión actual")
+        return 0, 0
+    print(f"Procesando {pending} ofertas con secciones (clasificador {version})...")
+
+    if SECTION_CACHE_PERSIST:
+        loaded = classifier.preload(load_section_title_cache(version))
+        print(f"Cache de títulos: {loaded} títulos precargados")
+    hits_before, misses_before = classifier.hits, classifier.misses
     
     processed = 0
     errors = 0
+    batch = []
+
+    def flush(jobs: list):
+        # Todos los títulos del lote se clasifican en una sola llamada (cdist)
+        categories = iter(classify_titles([
+            section.get('title', '') for job in jobs for section in job['sections']
+        ]))
+        rows = [
+            (job['job_id'], job['sections_hash'],
+             classify_sections(job['sections'], [next(categories) for _ in job['sections']]))
+            for job in jobs
+        ]
+        updated = update_job_sections_batch(rows, version)
+        return updated, len(rows) - updated
     
-    for job in jobs_data:
-        job_id = job['job_id']
-        sections = job['sections']
-        
-        # Clasificar cada sección
-        classified = {}
-        
-        for section in sections:
-            title = section.get('title', '')
-            content = section.get('content', '')
-            
-            # Clasificar usando el título
-            category = section_classifier(title)
-            
-            if category:
-                # Si ya existe esta categoría, concatenar
-                if category in classified:
-                    classified[category] += f"\n\n{content}"
-                else:
-                    classified[category] = content
-            else:
-                # Agregar a "others" si no se pudo clasificar
-                if 'others' not in classified:
-                    classified['others'] = ""
-                classified['others'] += f"\n\n[{title}]\n{content}"
-        
-        # Actualizar en la BD
-        if update_job_sections(job_id, classified):
-            processed += 1
-        else:
-            errors += 1
+    for job in iter_jobs_to_classify(version):
+        batch.append(job)
+        if len(batch) >= batch_size:
+            updated, failed = flush(batch)
+            processed += updated
+            errors += failed
+            batch = []
+
+    if batch:
+        updated, failed = flush(batch)
+        processed += updated
+        errors += failed
+
+    if SECTION_CACHE_PERSIST:
+        save_section_title_cache(classifier.drain_unsaved(), version)
+    hits = classifier.hits - hits_before
+    misses = classifier.misses - misses_before
+    print(f"Cache de títulos: {hits} aciertos, {misses} fallos, "
+          f"{classifier.cache_info()['size']} en memoria")
     
     print(f"\nResultados:")
     print(f"- Procesadas exitosamente: {processed}")
@@ -191,12 +530,18 @@ def main():
     print("👀 JobRadar Chile - Iniciando...")
     print(f"Fecha: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Crear/verificar tablas
+    # Crear/verificar tablas (la BD SQLite local siempre existe: guarda el índice
+    # del archivo HTML y, con el backend sqlite, también las URLs y ofertas)
     create_tables()
+    if STORAGE_BACKEND != 'sqlite':
+        get_storage().create_tables()
+    # backfill_technologies()  # Una vez: enlazar tecnologías de ofertas ya guardadas
+    # compress_text_columns()  # Una vez (o al cambiar TEXT_COMPRESSION): comprimir textos ya guardados
     
     # Ejecutar scraping
     # Solo categoría 'programming'
     # scrape_getonboard(GETONBOARD_CATEGORIES)  # Todas las categorías
+    # sweep_getonboard()  # Todas las categorías en paralelo
     scrape_getonboard(['programming'])
     
     # Mostrar estadísticas
@@ -205,11 +550,13 @@ def main():
     # Scraping de detalles de cada oferta
     #scrape_job_details()
     #scrape_job_details(test_mode=True)
+    #scrape_job_details(concurrent=True)
     scrape_job_details(limit=10)
 
-    # Verificar que hay datos para procesar
-    jobs_with_sections = get_jobs_sections_raw()
-    if jobs_with_sections:
+    # Verificar que hay datos para procesar (la clasificación trabaja sobre SQLite)
+    if STORAGE_BACKEND != 'sqlite':
+        print(f"⚠ Clasificación de secciones no disponible con STORAGE_BACKEND = '{STORAGE_BACKEND}'")
+    elif count_jobs_with_sections():
         process_all_sections()
     else:
         print("No hay ofertas con secciones para procesar")
@@ -242,4 +589,7 @@ if __name__ == "__main__":
         sys.exit(0)
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        close_storages()
+        close_db_connections()
\ No newline at end of file
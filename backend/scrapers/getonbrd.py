@@ -9,6 +9,8 @@ import os
 import re
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
@@ -17,76 +19,288 @@ import json
 
 from config import (
     GETONBOARD_JOBS_URL,
+    GETONBOARD_PAGE_PARAM,
+    GETONBOARD_MAX_LISTING_PAGES,
     DEFAULT_HEADERS,
     DEFAULT_TIMEOUT,
+    MAX_RETRIES,
+    HTTP_POOL_SIZE,
+    RETRY_BACKOFF_FACTOR,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUS_CODES,
     RAW_DATA_PATH,
-    MAX_JOB_AGE_DAYS
+    HTTP_CACHE_PATH,
+    HTTP_CACHE_ENABLED,
+    HTTP_CACHE_MAX_AGE_DAYS,
+    HTTP_CACHE_MAX_BYTES,
+    RAW_ARCHIVE_PATH,
+    RAW_ARCHIVE_ENABLED,
+    RAW_ARCHIVE_COMPRESSION,
+    MAX_JOB_AGE_DAYS,
+    MAX_CONCURRENCY_PER_HOST,
+    MAX_REQUESTS_PER_SECOND,
+    RATE_LIMIT_INITIAL,
+    RATE_LIMIT_MIN,
+    AIMD_INCREASE,
+    AIMD_DECREASE_FACTOR,
+    AIMD_LATENCY_FACTOR,
+    AIMD_LATENCY_FLOOR,
+    AIMD_COOLDOWN_SECONDS,
+    DETAIL_PARSER_ENGINE,
+    DETAIL_STREAMING,
+    STREAM_CHUNK_SIZE,
+    STREAM_SNIFF_MAX_BYTES
 )
+from scrapers.getonbrd_lxml import extract_job_fields
+from utils.rate_limiter import AdaptiveRateLimiter, HostThrottle, THROTTLE_STATUS_CODES
+from utils.http_cache import HttpCache
+from utils.raw_archive import RawArchive
+
+# Marcadores buscados en la cabecera del HTML durante la lectura incremental
+DATE_POSTED_TAG_RE = re.compile(rb'<time\b[^>]*\bitemprop=["\']datePosted["\'][^>]*>')
+DATETIME_ATTR_RE = re.compile(rb'\bdatetime=["\']([^"\']+)["\']')
+JOB_ID_RE = re.compile(rb'GETONBRD Job ID: (\d+)')
 
 
 class GetOnBoardScraper:
     """Scraper para el portal GetOnBoard"""
     
-    def __init__(self):
+    def __init__(self, parser_engine: str = DETAIL_PARSER_ENGINE, offline: bool = False):
         self.base_url = GETONBOARD_JOBS_URL
         self.headers = DEFAULT_HEADERS
         self.timeout = DEFAULT_TIMEOUT
         self.portal_name = "getonbrd.com" # harcodeado
+        self.parser_engine = parser_engine  # 'bs4' o 'lxml'
+        self.streaming = DETAIL_STREAMING
+        # Compartido entre hilos: limita requests simultáneas y ajusta el ritmo global (AIMD)
+        self.rate_limiter = AdaptiveRateLimiter(
+            initial_rate=RATE_LIMIT_INITIAL,
+            min_rate=RATE_LIMIT_MIN,
+            max_rate=MAX_REQUESTS_PER_SECOND,
+            increase=AIMD_INCREASE,
+            decrease_factor=AIMD_DECREASE_FACTOR,
+            latency_factor=AIMD_LATENCY_FACTOR,
+            latency_floor=AIMD_LATENCY_FLOOR,
+            cooldown=AIMD_COOLDOWN_SECONDS,
+        )
+        self.throttle = HostThrottle(MAX_CONCURRENCY_PER_HOST, self.rate_limiter)
+        # offline=True: solo parseo (re-parseo del archivo), sin red ni archivo
+        self.session = self._build_session() if not offline else None
+        self.cache = (
+            HttpCache(HTTP_CACHE_PATH, HTTP_CACHE_MAX_AGE_DAYS, HTTP_CACHE_MAX_BYTES)
+            if HTTP_CACHE_ENABLED and not offline else None
+        )
+        self.archive = (
+            RawArchive(RAW_ARCHIVE_PATH, RAW_ARCHIVE_COMPRESSION)
+            if RAW_ARCHIVE_ENABLED and not offline else None
+        )
+
+    def _build_session(self) -> requests.Session:
+        """
+        Crear una sesión HTTP con pool de conexiones keep-alive y reintentos
+        con backoff exponencial (respeta Retry-After en 429/5xx)
+        """
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            backoff_max=RETRY_BACKOFF_MAX,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=["GET", "HEAD"],
+            respect_retry_after_header=True,
+            raise_on_status=False,  # El último response lo valida raise_for_status
+        )
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def close(self):
+        """Cerrar las conexiones del pool HTTP y vaciar el archivo HTML pendiente"""
+        if self.session:
+            self.session.close()
+        if self.archive:
+            self.archive.close()
     
-    def scrape_job_listings(self, category: str = "programming") -> List[Tuple[str, str]]:
+    def _fetch(self, url: str, stream: bool = False, conditional: bool = True) -> Optional[requests.Response]:
+        """
+        Ejecutar un GET respetando el throttle del host. Si la URL está en la
+        cache se revalida con un GET condicional.
+        Args:
+            url: URL a descargar
+            stream: Si True, no se lee el body (el llamador lo consume y cachea)
+            conditional: Si False se descarga completo aunque esté en la cache
+        Returns: Response con status validado, o None si el servidor responde
+                 304 (sin cambios desde la última descarga)
+        """
+        headers = self.cache.conditional_headers(url) if self.cache and conditional else {}
+
+        with self.throttle.slot(url):
+            start = time.monotonic()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.Timeout, requests.ConnectionError):
+                self.rate_limiter.record(None, time.monotonic() - start)
+                raise
+            self.rate_limiter.record(
+                response.status_code,
+                time.monotonic() - start,
+                throttled=self._was_throttled(response)
+            )
+
+        if response.status_code == 304 and self.cache:
+            response.close()
+            self.cache.touch(url)
+            return None
+
+        response.raise_for_status()
+        if self.cache and not stream:
+            self.cache.store(url, response)
+        return response
+
+    def _was_throttled(self, response: requests.Response) -> bool:
+        """True si urllib3 tuvo que reintentar por 429/503 o errores antes de este response"""
+        retries = getattr(response.raw, 'retries', None)
+        history = retries.history if retries else ()
+        return any(attempt.status in THROTTLE_STATUS_CODES or attempt.error for attempt in history)
+
+    def _read_detail_streaming(self, job_url: str, response: requests.Response) -> Optional[bytes]:
+        """
+        Leer el detalle por partes y cortar la conexión apenas datePosted
+        indica que la oferta está fuera de rango
+        Args:
+            job_url: URL de la oferta
+            response: Response abierto en modo stream
+        Returns: Bytes completos del HTML, o None si la oferta se descartó
+        """
+        chunks = []
+        size = 0
+        sniffing = True
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                size += len(chunk)
+                if not sniffing:
+                    continue
+
+                head = b''.join(chunks)
+                tag_match = DATE_POSTED_TAG_RE.search(head)
+                if tag_match:
+                    sniffing = False
+                    date_match = DATETIME_ATTR_RE.search(tag_match.group(0))
+                    date_posted = date_match.group(1).decode('utf-8') if date_match else None
+                    if not self._validate_posted_date(date_posted):
+                        job_id_match = JOB_ID_RE.search(head)
+                        job_id = job_id_match.group(1).decode() if job_id_match else "unknown"
+                        print(f"Descarga cortada en {size} bytes (job_id: {job_id})")
+                        return None
+                elif size >= STREAM_SNIFF_MAX_BYTES:
+                    sniffing = False
+        finally:
+            response.close()
+
+        content = b''.join(chunks)
+        if self.cache:
+            self.cache.store(job_url, response, body=content)
+        return content
+
+    def scrape_job_listings(self, category: str = "programming", known_urls: Optional[set] = None,
+                            max_pages: int = GETONBOARD_MAX_LISTING_PAGES) -> List[Tuple[str, str]]:
         """
-        Obtener listado de trabajos de una categoría
-        Args: category: Categoría a scrapear (ej: 'programming')
-        Returns: Lista de tuplas (url, posted_date)
+        Obtener listado de trabajos de una categoría recorriendo su paginación.
+        Se detiene en la primera página que solo trae URLs ya conocidas o
+        fechas fuera de rango.
+        Args:
+            category: Categoría a scrapear (ej: 'programming')
+            known_urls: URLs ya guardadas en job_urls (se actualiza con las nuevas)
+            max_pages: Tope de páginas a recorrer
+        Returns: Lista de tuplas (url, posted_date) nuevas
         """
-        url = f"{self.base_url}/{category}"
+        base_url = f"{self.base_url}/{category}"
+        known_urls = known_urls if known_urls is not None else set()
         print(f"Scrapeando categoría: {category}")
-        print(f"URL: {url}")
+        print(f"URL: {base_url}")
         print("... 👀 ...")
+
+        jobs_data = []
+        for page in range(1, max_pages + 1):
+            url = base_url if page == 1 else f"{base_url}?{GETONBOARD_PAGE_PARAM}={page}"
+
+            try:
+                page_jobs = self._scrape_listing_page(url)
+            except requests.RequestException as e:
+                print(f"Error en request: {e}")
+                break
+            except Exception as e:
+                print(f"Error scrapeando {category} (página {page}): {e}")
+                break
+
+            if page_jobs is None:
+                print(f"Página {page} sin cambios desde la última visita (304)")
+                break
+            if not page_jobs:
+                print(f"Página {page} sin trabajos, fin de la paginación")
+                break
+
+            # Solo agregar si es reciente y no está ya en la BD
+            recent_jobs = [(job_url, date_text) for job_url, date_text in page_jobs if self._is_recent_job(date_text)]
+            new_jobs = [(job_url, date_text) for job_url, date_text in recent_jobs if job_url not in known_urls]
+            known_urls.update(job_url for job_url, _ in new_jobs)
+            jobs_data.extend(new_jobs)
+            print(f"Página {page}: {len(page_jobs)} trabajos, {len(recent_jobs)} recientes, {len(new_jobs)} nuevos")
+
+            if not recent_jobs:
+                print(f"Página {page} solo con fechas fuera de rango, fin de la categoría")
+                break
+            if not new_jobs:
+                print(f"Página {page} solo con URLs conocidas, fin de la categoría")
+                break
+
+        print(f"Trabajos nuevos filtrados (últimos {MAX_JOB_AGE_DAYS} días): {len(jobs_data)}")
+
+        # Guardar URLs filtradas para debugging
+        self._save_job_urls(jobs_data, f"job_urls_{category}.txt")
+
+        return jobs_data
+
+    def _scrape_listing_page(self, url: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Obtener los trabajos de una página de listado
+        Args: url: URL de la página
+        Returns: Lista de tuplas (url, posted_date) sin filtrar, o None si hubo 304
+        """
+        # Request
+        response = self._fetch(url)
+        if response is None:
+            return None
+        print(f"Status: {response.status_code}")
         
-        try:
-            # Request
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            print(f"Status: {response.status_code}")
-            
-            # Parsear HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Guardar HTML para debugging
-            self._save_raw_html(soup, f"soup_{category}.txt")
-            
-            # Buscar trabajos
-            job_items = soup.find_all('a', class_='gb-results-list__item')
-            print(f"Trabajos encontrados totales: {len(job_items)}")
-            
-            # Procesar cada trabajo
-            jobs_data = []
-            for job_item in job_items:
-                job_url = job_item.get('href', '')
-                
-                # Extraer fecha
-                date_element = job_item.select_one('.opacity-half.size0')
-                date_text = date_element.get_text(strip=True) if date_element else ""
-                
-                # Solo agregar si es reciente
-                if self._is_recent_job(date_text):
-                    jobs_data.append((job_url, date_text))
-            
-            print(f"Trabajos filtrados (últimos {MAX_JOB_AGE_DAYS} días): {len(jobs_data)}")
-            
-            # Guardar URLs filtradas para debugging
-            self._save_job_urls(jobs_data, f"job_urls_{category}.txt")
-            
-            return jobs_data
-            
-        except requests.RequestException as e:
-            print(f"Error en request: {e}")
-            return []
-        except Exception as e:
-            print(f"Error scrapeando {category}: {e}")
-            return []
+        # Archivar los bytes originales (en segundo plano)
+        if self.archive:
+            self.archive.put(url, response.content)
+
+        # Parsear HTML
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # Buscar trabajos
+        job_items = soup.find_all('a', class_='gb-results-list__item')
+        
+        # Procesar cada trabajo
+        page_jobs = []
+        for job_item in job_items:
+            job_url = job_item.get('href', '')
+            
+            # Extraer fecha
+            date_element = job_item.select_one('.opacity-half.size0')
+            date_text = date_element.get_text(strip=True) if date_element else ""
+            page_jobs.append((job_url, date_text))
 
+        return page_jobs
 
     def _is_recent_job(self, date_text: str) -> bool:
         """
@@ -124,15 +338,6 @@ class GetOnBoardScraper:
             #print(f"Error parseando fecha '{date_text}': {e}")
             return False
     
-    def _save_raw_html(self, soup: BeautifulSoup, filename: str):
-        """Guardar HTML crudo para debugging"""
-        os.makedirs(RAW_DATA_PATH, exist_ok=True)
-        filepath = os.path.join(RAW_DATA_PATH, filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
-        print(f"HTML guardado: {filepath}")
-    
     def _save_job_urls(self, jobs_data: List[Tuple[str, str]], filename: str):
         """Guardar URLs de trabajos para debugging"""
         os.makedirs(RAW_DATA_PATH, exist_ok=True)
@@ -160,301 +365,422 @@ class GetOnBoardScraper:
             print(f"Scrapeando detalle: {job_url}")
             
             # Request con headers y timeout
-            response = requests.get(job_url, headers=self.headers, timeout=self.timeout)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extraer job_id primero para usar en filename
-            job_id_match = re.search(r'GETONBRD Job ID: (\d+)', soup.get_text())
-            job_id = job_id_match.group(1) if job_id_match else "unknown"
+            content = None
+            response = self._fetch(job_url, stream=self.streaming)
+            if response is None:
+                # Solo se piden detalles de URLs sin procesar: un 304 significa que el
+                # intento anterior no llegó a guardarse, así que se parsea la copia cacheada
+                content = self.cache.load_body(job_url)
+                if content is None:
+                    response = self._fetch(job_url, stream=self.streaming, conditional=False)
+                else:
+                    print("Sin cambios desde la última visita (304), se parsea la copia en cache")
+
+            if content is None:
+                if self.streaming:
+                    content = self._read_detail_streaming(job_url, response)
+                    if content is None:
+                        return None
+                else:
+                    content = response.content
+
+            job_detail = None
+            try:
+                job_detail = self.parse_job_detail(content, job_url)
+                return job_detail
+            finally:
+                # Archivar los bytes originales (en segundo plano), aunque el parseo falle
+                if self.archive:
+                    self.archive.put(job_url, content, job_id=job_detail['job_id'] if job_detail else None)
             
-            # Guardar HTML para debugging
-            # self._save_raw_html(soup, f"job_detail_{job_id}.txt")
+        except requests.RequestException as e:
+            print(f"Error de conexión con {job_url}: {e}")
+            return None
+        except Exception as e:
+            print(f"Error parseando {job_url}: {e}")
+            return None
+
+    def parse_job_detail(self, content: bytes, job_url: str, check_age: bool = True) -> Optional[dict]:
+        """
+        Extraer el detalle de una oferta desde el HTML ya descargado
+        Args:
+            content: Bytes del HTML de la oferta
+            job_url: URL completa de la oferta
+            check_age: Si False no se descartan ofertas antiguas (re-parseo del historial)
+        Returns: Diccionario con los detalles del trabajo o None si se descarta
+        """
+        if self.parser_engine == 'lxml':
+            # Una sola pasada sobre el árbol lxml
+            fields = extract_job_fields(content)
+            posted_date_clean = self._validate_posted_date(fields['date_posted'], check_age)
+            if not posted_date_clean:
+                return None
+        else:
+            soup = BeautifulSoup(content, 'html.parser')
+            fields = self._extract_job_header_bs4(soup)
 
             # VALIDACIÓN DE FECHA - RETORNO TEMPRANO
-            date_posted_tag = soup.find('time', itemprop='datePosted')
-            date_posted = date_posted_tag['datetime'] if date_posted_tag and date_posted_tag.has_attr('datetime') else None
-            posted_date_clean = datetime.fromisoformat(date_posted).date().isoformat() if date_posted else None
-
-            if posted_date_clean:
-                try:
-                    job_date = datetime.fromisoformat(posted_date_clean)
-                    days_old = (datetime.now() - job_date).days
-                    
-                    if days_old > MAX_JOB_AGE_DAYS:
-                        print(f"Trabajo descartado: {posted_date_clean} ({days_old} días)")
-                        return None
-                        
-                except Exception as e:
-                    print(f"Error validando fecha: {e}")
-                    return None
-            else:
-                print("Trabajo descartado: sin fecha")
+            posted_date_clean = self._validate_posted_date(fields['date_posted'], check_age)
+            if not posted_date_clean:
                 return None
-            
-            # Básicos
-            job_portal = self.portal_name
+            fields.update(self._extract_job_body_bs4(soup))
 
-            title = soup.find('span', itemprop='title')
-            job_title = title.get_text(strip=True) if title else None
-            
-            company_tag = soup.find('strong', itemprop='name')
-            company_name = company_tag.get_text(strip=True) if company_tag else None
-            
-            company_url_tag = soup.find('span', itemprop='url')
-            company_url = company_url_tag.get_text(strip=True) if company_url_tag else None
+        return self._build_job_detail(fields, job_url, posted_date_clean)
 
-            # Location y Modalidad combinados
-            location_modality = None
-            location_element = soup.select_one('.location')
+    def diff_parser_engines(self, content: bytes) -> dict:
+        """
+        Comparar los campos crudos que extrae cada motor sobre el mismo HTML
+        Args: content: Bytes del HTML de la oferta
+        Returns: Diccionario {campo: (valor_bs4, valor_lxml)} con las diferencias
+        """
+        soup = BeautifulSoup(content, 'html.parser')
+        bs4_fields = self._extract_job_header_bs4(soup)
+        bs4_fields.update(self._extract_job_body_bs4(soup))
+        lxml_fields = extract_job_fields(content)
 
-            if location_element:
-                # Primero eliminar elementos ocultos
-                for hidden in location_element.select('.hide, .location-tooltip-content'):
-                    hidden.decompose()
-                
-                # Buscar diferentes estructuras
-                # Caso 1: Con link (Santiago)
-                location_link = location_element.select_one('a')
-                if location_link:
-                    # Obtener el texto del link
-                    location_text = location_link.get_text(strip=True)
-                    # Buscar el texto después del link (debería ser "(In-office)" o similar)
-                    next_text = location_link.next_sibling
-                    if next_text and isinstance(next_text, str):
-                        location_modality = location_text + ' ' + next_text.strip()
-                    else:
-                        # Buscar en todo el elemento padre
-                        parent_text = location_element.get_text(separator=' ', strip=True)
-                        location_modality = ' '.join(parent_text.split())
-                else:
-                    # Caso 2: Sin link (Remote)
-                    location_modality = location_element.get_text(separator=' ', strip=True)
-                    location_modality = ' '.join(location_modality.split())
+        return {
+            key: (bs4_fields.get(key), lxml_fields.get(key))
+            for key in bs4_fields.keys() | lxml_fields.keys()
+            if bs4_fields.get(key) != lxml_fields.get(key)
+        }
+
+    def _validate_posted_date(self, date_posted: Optional[str], check_age: bool = True) -> Optional[str]:
+        """
+        Validar la fecha de publicación (atributo datetime de datePosted)
+        Args:
+            date_posted: Fecha ISO tal como viene en el HTML
+            check_age: Si False solo se exige que la fecha exista
+        Returns: Fecha limpia (YYYY-MM-DD) o None si el trabajo se descarta
+        """
+        posted_date_clean = datetime.fromisoformat(date_posted).date().isoformat() if date_posted else None
+
+        if posted_date_clean and not check_age:
+            return posted_date_clean
+
+        if posted_date_clean:
+            try:
+                job_date = datetime.fromisoformat(posted_date_clean)
+                days_old = (datetime.now() - job_date).days
                 
-                # Limpiar caracteres especiales
-                location_modality = location_modality.replace('\xa0', ' ').strip()
-
-            # Separar location y modality
-            location = None
-            modality = None
-
-            if location_modality:
-                # Si viene entre paréntesis: Remote (Chile), Santiago (In-office)
-                match = re.search(r'^(.*?)\s*\((.*?)\)$', location_modality)
-                if match:
-                    first_part = match.group(1).strip()
-                    second_part = match.group(2).strip()
+                if days_old > MAX_JOB_AGE_DAYS:
+                    print(f"Trabajo descartado: {posted_date_clean} ({days_old} días)")
+                    return None
                     
-                    # Determinar qué es qué
-                    if first_part.lower() == 'remote' or first_part.lower() == 'remoto':
-                        # Remote (Chile) -> location=Chile, modality=Remote
-                        location = second_part
-                        modality = first_part
-                    else:
-                        # Santiago (In-office) -> location=Santiago, modality=In-office
-                        location = first_part
-                        modality = second_part
-                else:
-                    # Sin paréntesis
-                    if location_modality.lower() in ['remote', 'remoto']:
-                        # Solo dice "Remoto" -> modality=Remoto, location=Not specified
-                        location = 'Not specified'
-                        modality = location_modality
-                    else:
-                        # Solo dice "Santiago" -> location=Santiago, modality=Not specified
-                        location = location_modality
-                        modality = 'Not specified'
-
-
-            experience_tag = soup.find('span', itemprop='qualifications')
-            experience = experience_tag.get_text(strip=True) if experience_tag else None
-            
-            employment_type_tag = soup.find('span', itemprop='employmentType')
-            employment_type = employment_type_tag.get_text(strip=True) if employment_type_tag else None
-            
-            # Extraer categoría de la URL
-            category = None
-            try:
-                # Buscar el patrón después de /jobs/ o /empleos/ o cualquier idioma
-                match = re.search(r'/(?:jobs|empleos|empregos|emplois)/([^/]+)/', job_url)
-                if match:
-                    category = match.group(1)
-                    # Normalizar: programming -> Programming, design-ux -> Design Ux
-                    category = category.replace('-', ' ').title()
-            except:
-                category = None
-
-            # Sueldo
-            salary_scope = soup.find('span', itemprop='baseSalary')
-            if salary_scope:
-                min_salary = salary_scope.find('span', itemprop='minValue')
-                max_salary = salary_scope.find('span', itemprop='maxValue')
-                currency = salary_scope.find('span', itemprop='currency')
-                unit = salary_scope.find('span', itemprop='unitText')
-                salary_min = min_salary['content'] if min_salary and min_salary.has_attr('content') else None
-                salary_max = max_salary['content'] if max_salary and max_salary.has_attr('content') else None
-                salary_currency = currency['content'] if currency and currency.has_attr('content') else None
-                salary_unit = unit['content'] if unit and unit.has_attr('content') else None
-                salary_disclosed = True
-                salary_raw = f"{salary_min} - {salary_max} {salary_currency}/{salary_unit}"
-
-                # Detectar si es sueldo bruto o líquido
-                salary_type_span = salary_scope.find('span', class_='hide-on-small-mobile')
-                salary_type = salary_type_span.get_text(strip=True).lower() if salary_type_span else None
+            except Exception as e:
+                print(f"Error validando fecha: {e}")
+                return None
+        else:
+            print("Trabajo descartado: sin fecha")
+            return None
+
+        return posted_date_clean
+
+    def _extract_job_header_bs4(self, soup: BeautifulSoup) -> dict:
+        """Extraer job_id y fecha de publicación (lo mínimo para validar la oferta)"""
+        # Extraer job_id primero para usar en filename
+        job_id_match = re.search(r'GETONBRD Job ID: (\d+)', soup.get_text())
+        job_id = job_id_match.group(1) if job_id_match else "unknown"
+
+        date_posted_tag = soup.find('time', itemprop='datePosted')
+        date_posted = date_posted_tag['datetime'] if date_posted_tag and date_posted_tag.has_attr('datetime') else None
 
+        return {'job_id': job_id, 'date_posted': date_posted}
+
+    def _extract_job_body_bs4(self, soup: BeautifulSoup) -> dict:
+        """
+        Extraer los campos crudos de la oferta con BeautifulSoup
+        Returns: Diccionario con las mismas claves que extract_job_fields (lxml)
+        """
+        # Básicos
+        title = soup.find('span', itemprop='title')
+        job_title = title.get_text(strip=True) if title else None
+        
+        company_tag = soup.find('strong', itemprop='name')
+        company_name = company_tag.get_text(strip=True) if company_tag else None
+        
+        company_url_tag = soup.find('span', itemprop='url')
+        company_url = company_url_tag.get_text(strip=True) if company_url_tag else None
+
+        # Location y Modalidad combinados
+        location_modality = None
+        location_element = soup.select_one('.location')
+
+        if location_element:
+            # Primero eliminar elementos ocultos
+            for hidden in location_element.select('.hide, .location-tooltip-content'):
+                hidden.decompose()
+            
+            # Buscar diferentes estructuras
+            # Caso 1: Con link (Santiago)
+            location_link = location_element.select_one('a')
+            if location_link:
+                # Obtener el texto del link
+                location_text = location_link.get_text(strip=True)
+                # Buscar el texto después del link (debería ser "(In-office)" o similar)
+                next_text = location_link.next_sibling
+                if next_text and isinstance(next_text, str):
+                    location_modality = location_text + ' ' + next_text.strip()
+                else:
+                    # Buscar en todo el elemento padre
+                    parent_text = location_element.get_text(separator=' ', strip=True)
+                    location_modality = ' '.join(parent_text.split())
             else:
-                salary_min = salary_max = salary_currency = salary_unit = salary_raw = salary_type = None
-                salary_disclosed = False
+                # Caso 2: Sin link (Remote)
+                location_modality = location_element.get_text(separator=' ', strip=True)
+                location_modality = ' '.join(location_modality.split())
             
-            # Descripción HTML cruda
-            description_div = soup.find('div', itemprop='description')
-            
-            # Extraer descripción de la empresa
-            company_description = ""
-            if description_div:
-                first_rich_txt = description_div.find('div', class_='gb-rich-txt')
-                if first_rich_txt:
-                    # Obtener todos los p y div, excepto el disclaimer final
-                    content_elements = first_rich_txt.find_all(['p', 'div'])
-                    
-                    # Filtrar el disclaimer (contiene "getonbrd.com" o "Get on Board")
-                    descriptions = []
-                    for elem in content_elements:
-                        text = elem.get_text(strip=True)
-                        if text and not any(disclaimer in text for disclaimer in ['getonbrd.com', 'Get on Board']):
-                            descriptions.append(text)
-                    # Unir todo con espacios
-                    company_description = ' '.join(descriptions)
-
-            # Secciones textuales (functions, requirements, nice_to_have, benefits)
-            sections = []
-            for div in soup.find_all('div', class_='mb4'):
-                h3 = div.find('h3')
-                content_div = div.find('div', class_='gb-rich-txt')
+            # Limpiar caracteres especiales
+            location_modality = location_modality.replace('\xa0', ' ').strip()
+
+        experience_tag = soup.find('span', itemprop='qualifications')
+        experience = experience_tag.get_text(strip=True) if experience_tag else None
+        
+        employment_type_tag = soup.find('span', itemprop='employmentType')
+        employment_type = employment_type_tag.get_text(strip=True) if employment_type_tag else None
+
+        # Sueldo
+        salary_scope = soup.find('span', itemprop='baseSalary')
+        if salary_scope:
+            min_salary = salary_scope.find('span', itemprop='minValue')
+            max_salary = salary_scope.find('span', itemprop='maxValue')
+            currency = salary_scope.find('span', itemprop='currency')
+            unit = salary_scope.find('span', itemprop='unitText')
+            salary_min = min_salary['content'] if min_salary and min_salary.has_attr('content') else None
+            salary_max = max_salary['content'] if max_salary and max_salary.has_attr('content') else None
+            salary_currency = currency['content'] if currency and currency.has_attr('content') else None
+            salary_unit = unit['content'] if unit and unit.has_attr('content') else None
+
+            # Detectar si es sueldo bruto o líquido
+            salary_type_span = salary_scope.find('span', class_='hide-on-small-mobile')
+            salary_type = salary_type_span.get_text(strip=True).lower() if salary_type_span else None
+
+        else:
+            salary_min = salary_max = salary_currency = salary_unit = salary_type = None
+        
+        # Descripción HTML cruda
+        description_div = soup.find('div', itemprop='description')
+        
+        # Extraer descripción de la empresa
+        company_description = ""
+        if description_div:
+            first_rich_txt = description_div.find('div', class_='gb-rich-txt')
+            if first_rich_txt:
+                # Obtener todos los p y div, excepto el disclaimer final
+                content_elements = first_rich_txt.find_all(['p', 'div'])
                 
-                if h3 and content_div:  # Solo agregar si ambos existen
-                    sections.append({
-                        'title': h3.get_text(strip=True),
-                        'content': content_div.get_text(separator='\n', strip=True)
-                    })
-            
-            # Postulaciones y revisión
-            meta_info = soup.select_one('.size0.mt1')
-            meta_text = meta_info.get_text() if meta_info else ""
-            
-            # Buscar applications en inglés o español
-            # Prefiero confiar en el html que en palabras en algún idioma
-            applications_match = re.search(r'(\d+)\s+(applications?|postulaciones?)', meta_text, re.IGNORECASE) 
-            applications = int(applications_match.group(1)) if applications_match else None
-
-            # Para reply_time y last_checked - buscar el div específico
-            # Igual puede dar lo mismo en el idioma que venga, y que extraigamos las palabras originales
-            reply_time = None
-            last_checked = None
-            meta_div = soup.find('div', class_='size0 mt1')
-            if meta_div:
-                # Buscar dos números para reply time
-                numbers = re.findall(r'\d+', meta_div.get_text())
-                if len(numbers) >= 3:  # 46, 15, 27
-                    reply_time = f"{numbers[1]}-{numbers[2]} days"
+                # Filtrar el disclaimer (contiene "getonbrd.com" o "Get on Board")
+                descriptions = []
+                for elem in content_elements:
+                    text = elem.get_text(strip=True)
+                    if text and not any(disclaimer in text for disclaimer in ['getonbrd.com', 'Get on Board']):
+                        descriptions.append(text)
+                # Unir todo con espacios
+                company_description = ' '.join(descriptions)
+
+        # Secciones textuales (functions, requirements, nice_to_have, benefits)
+        sections = []
+        for div in soup.find_all('div', class_='mb4'):
+            h3 = div.find('h3')
+            content_div = div.find('div', class_='gb-rich-txt')
+            
+            if h3 and content_div:  # Solo agregar si ambos existen
+                sections.append({
+                    'title': h3.get_text(strip=True),
+                    'content': content_div.get_text(separator='\n', strip=True)
+                })
+        
+        # Postulaciones y revisión
+        meta_info = soup.select_one('.size0.mt1')
+        meta_text = meta_info.get_text() if meta_info else ""
+
+        # Para reply_time y last_checked - buscar el div específico
+        meta_div = soup.find('div', class_='size0 mt1')
+        meta_div_text = meta_div.get_text() if meta_div else None
+        
+        # Perks (íconos con texto)
+        perks = []
+        perk_tags = soup.select('.gb-fluid-boxes__item strong')
+        for tag in perk_tags:
+            perks.append(tag.get_text(strip=True))
+        
+        # Remote work policy
+        remote_policy = None
+        # Buscar en inglés y español
+        for h2 in soup.find_all('h2'):
+            h2_text = h2.get_text(strip=True)
+            if 'Remote work policy' in h2_text or 'Política de trabajo remoto' in h2_text:
+                # El siguiente elemento después del h2
+                next_elem = h2.find_next_sibling()
+                if next_elem and next_elem.name == 'p':
+                    # El párrafo con la descripción está después del primero
+                    desc_elem = next_elem.find_next_sibling('p')
+                    if desc_elem:
+                        remote_policy = desc_elem.get_text(strip=True)
+                        break
+
+
+        # Tags tecnológicos (dentro del contenedor de skills)
+        technologies = []
+        skills_container = soup.find('div', class_='gb-tags', itemprop='skills')
+        if skills_container:
+            tech_tags = skills_container.find_all('a', class_='gb-tags__item')
+            technologies = [tag.get_text(strip=True) for tag in tech_tags]
+
+        
+        # URL de postulación
+        apply_btn = soup.find('a', id='apply_bottom')
+        apply_url = apply_btn['href'] if apply_btn and apply_btn.has_attr('href') else None
+
+        return {
+            'job_title': job_title,
+            'company_name': company_name,
+            'company_url': company_url,
+            'location_modality': location_modality,
+            'experience': experience,
+            'employment_type': employment_type,
+            'salary_disclosed': salary_scope is not None,
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'salary_currency': salary_currency,
+            'salary_unit': salary_unit,
+            'salary_type': salary_type,
+            'company_description': company_description,
+            'sections': sections,
+            'meta_text': meta_text,
+            'meta_div_text': meta_div_text,
+            'perks': perks,
+            'remote_policy': remote_policy,
+            'technologies': technologies,
+            'apply_url': apply_url,
+        }
+
+    def _build_job_detail(self, fields: dict, job_url: str, posted_date_clean: str) -> dict:
+        """
+        Armar el diccionario final de la oferta a partir de los campos crudos
+        (común a ambos motores de parseo)
+        """
+        # Básicos
+        job_portal = self.portal_name
+        location_modality = fields['location_modality']
+
+        # Separar location y modality
+        location = None
+        modality = None
+
+        if location_modality:
+            # Si viene entre paréntesis: Remote (Chile), Santiago (In-office)
+            match = re.search(r'^(.*?)\s*\((.*?)\)$', location_modality)
+            if match:
+                first_part = match.group(1).strip()
+                second_part = match.group(2).strip()
                 
-                # Para last checked, buscar la última línea del div
-                lines = [line.strip() for line in meta_div.get_text().split('\n') if line.strip()]
-                if lines:
-                    last_checked = 'today' if any(word in lines[-1].lower() for word in ['hoy', 'today']) else None
+                # Determinar qué es qué
+                if first_part.lower() == 'remote' or first_part.lower() == 'remoto':
+                    # Remote (Chile) -> location=Chile, modality=Remote
+                    location = second_part
+                    modality = first_part
+                else:
+                    # Santiago (In-office) -> location=Santiago, modality=In-office
+                    location = first_part
+                    modality = second_part
+            else:
+                # Sin paréntesis
+                if location_modality.lower() in ['remote', 'remoto']:
+                    # Solo dice "Remoto" -> modality=Remoto, location=Not specified
+                    location = 'Not specified'
+                    modality = location_modality
+                else:
+                    # Solo dice "Santiago" -> location=Santiago, modality=Not specified
+                    location = location_modality
+                    modality = 'Not specified'
+        
+        # Extraer categoría de la URL
+        category = None
+        try:
+            # Buscar el patrón después de /jobs/ o /empleos/ o cualquier idioma
+            match = re.search(r'/(?:jobs|empleos|empregos|emplois)/([^/]+)/', job_url)
+            if match:
+                category = match.group(1)
+                # Normalizar: programming -> Programming, design-ux -> Design Ux
+                category = category.replace('-', ' ').title()
+        except:
+            category = None
 
-            
-            # Perks (íconos con texto)
-            perks = []
-            perk_tags = soup.select('.gb-fluid-boxes__item strong')
-            for tag in perk_tags:
-                perks.append(tag.get_text(strip=True))
-            
-            # Remote work policy
-            remote_policy = None
-            # Buscar en inglés y español
-            for h2 in soup.find_all('h2'):
-                h2_text = h2.get_text(strip=True)
-                if 'Remote work policy' in h2_text or 'Política de trabajo remoto' in h2_text:
-                    # El siguiente elemento después del h2
-                    next_elem = h2.find_next_sibling()
-                    if next_elem and next_elem.name == 'p':
-                        # El párrafo con la descripción está después del primero
-                        desc_elem = next_elem.find_next_sibling('p')
-                        if desc_elem:
-                            remote_policy = desc_elem.get_text(strip=True)
-                            break
-
-
-            # Tags tecnológicos (dentro del contenedor de skills)
-            technologies = []
-            skills_container = soup.find('div', class_='gb-tags', itemprop='skills')
-            if skills_container:
-                tech_tags = skills_container.find_all('a', class_='gb-tags__item')
-                technologies = [tag.get_text(strip=True) for tag in tech_tags]
+        # Sueldo
+        salary_disclosed = fields['salary_disclosed']
+        salary_raw = None
+        if salary_disclosed:
+            salary_raw = f"{fields['salary_min']} - {fields['salary_max']} {fields['salary_currency']}/{fields['salary_unit']}"
 
-            
-            # URL de postulación
-            apply_btn = soup.find('a', id='apply_bottom')
-            apply_url = apply_btn['href'] if apply_btn and apply_btn.has_attr('href') else None
+        # Buscar applications en inglés o español
+        # Prefiero confiar en el html que en palabras en algún idioma
+        applications_match = re.search(r'(\d+)\s+(applications?|postulaciones?)', fields['meta_text'], re.IGNORECASE) 
+        applications = int(applications_match.group(1)) if applications_match else None
 
-            scraped_at_clean = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Construir diccionario de resultado
-            job_detail = {
-                'job_id': job_id,
-                'source_url': job_url,
-                'portal_name': job_portal,
-                'posted_date': posted_date_clean,
-                'job_title_raw': job_title,
-                'job_category_raw': category,
-                'company_name_raw': company_name,
-                'company_url_raw': company_url,
-                'company_description_raw': company_description,
-                'location_work_mode_raw': location_modality,
-                'location_raw': location,
-                'work_mode_raw': modality,
-                'seniority_raw': experience,
-                'employment_type_raw': employment_type,
-                'salary_disclosed': salary_disclosed,
-                'salary_raw': salary_raw,
-                'salary_min_raw': salary_min,
-                'salary_max_raw': salary_max,
-                'salary_currency_raw': salary_currency,
-                'salary_unit_raw': salary_unit,
-                'salary_type_raw': salary_type,
-                'tech_stack_raw': technologies,
-                'sections_raw': sections,
-                'perks_raw': perks,
-                'last_checked': last_checked,
-                'applications_raw': applications,
-                'reply_time_raw': reply_time,
-                'remote_policy_raw': remote_policy,
-                'apply_url': apply_url,
-                'scraped_at': scraped_at_clean,
-            }
-            
-            '''# SOLO PARA TEST DEBUG COMENTAR PARA DESARROLLO
-            # Guardar publicación en json
-            os.makedirs(RAW_DATA_PATH, exist_ok=True)
-            # Extraer el slug de la URL
-            url_parts = job_url.rstrip('/').split('/')
-            slug = url_parts[-1] if url_parts else 'unknown'
-            # Limitar longitud del slug y combinarlo con job_id
-            slug_truncated = slug[:50]  # Limitar a 50 caracteres
-            filename = f"job_{job_id}_{slug_truncated}.json"
-
-            filepath = os.path.join(RAW_DATA_PATH, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(job_detail, f, ensure_ascii=False, indent=4)'''
+        # Para reply_time y last_checked - buscar el div específico
+        # Igual puede dar lo mismo en el idioma que venga, y que extraigamos las palabras originales
+        reply_time = None
+        last_checked = None
+        meta_div_text = fields['meta_div_text']
+        if meta_div_text is not None:
+            # Buscar dos números para reply time
+            numbers = re.findall(r'\d+', meta_div_text)
+            if len(numbers) >= 3:  # 46, 15, 27
+                reply_time = f"{numbers[1]}-{numbers[2]} days"
+            
+            # Para last checked, buscar la última línea del div
+            lines = [line.strip() for line in meta_div_text.split('\n') if line.strip()]
+            if lines:
+                last_checked = 'today' if any(word in lines[-1].lower() for word in ['hoy', 'today']) else None
 
-            
-            return job_detail
-            
-        except requests.RequestException as e:
-            print(f"Error de conexión con {job_url}: {e}")
-            return None
-        except Exception as e:
-            print(f"Error parseando {job_url}: {e}")
-            return None
\ No newline at end of file
+        scraped_at_clean = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Construir diccionario de resultado
+        job_detail = {
+            'job_id': fields['job_id'],
+            'source_url': job_url,
+            'portal_name': job_portal,
+            'posted_date': posted_date_clean,
+            'job_title_raw': fields['job_title'],
+            'job_category_raw': category,
+            'company_name_raw': fields['company_name'],
+            'company_url_raw': fields['company_url'],
+            'company_description_raw': fields['company_description'],
+            'location_work_mode_raw': location_modality,
+            'location_raw': location,
+            'work_mode_raw': modality,
+            'seniority_raw': fields['experience'],
+            'employment_type_raw': fields['employment_type'],
+            'salary_disclosed': salary_disclosed,
+            'salary_raw': salary_raw,
+            'salary_min_raw': fields['salary_min'],
+            'salary_max_raw': fields['salary_max'],
+            'salary_currency_raw': fields['salary_currency'],
+            'salary_unit_raw': fields['salary_unit'],
+            'salary_type_raw': fields['salary_type'],
+            'tech_stack_raw': fields['technologies'],
+            'sections_raw': fields['sections'],
+            'perks_raw': fields['perks'],
+            'last_checked': last_checked,
+            'applications_raw': applications,
+            'reply_time_raw': reply_time,
+            'remote_policy_raw': fields['remote_policy'],
+            'apply_url': fields['apply_url'],
+            'scraped_at': scraped_at_clean,
+        }
+        
+        '''# SOLO PARA TEST DEBUG COMENTAR PARA DESARROLLO
+        # Guardar publicación en json
+        os.makedirs(RAW_DATA_PATH, exist_ok=True)
+        # Extraer el slug de la URL
+        url_parts = job_url.rstrip('/').split('/')
+        slug = url_parts[-1] if url_parts else 'unknown'
+        # Limitar longitud del slug y combinarlo con job_id
+        slug_truncated = slug[:50]  # Limitar a 50 caracteres
+        filename = f"job_{job_id}_{slug_truncated}.json"
+
+        filepath = os.path.join(RAW_DATA_PATH, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(job_detail, f, ensure_ascii=False, indent=4)'''
+
+        return job_detail
@@ -0,0 +1,290 @@
+# backend/scrapers/getonbrd_lxml.py
+
+"""
+Motor de extracción rápido para el detalle de ofertas de GetOnBoard
+Recorre el árbol lxml una sola vez y reproduce la semántica de BeautifulSoup
+(find, select, get_text) de GetOnBoardScraper._extract_job_body_bs4
+"""
+
+import re
+from typing import Iterator, List, Optional
+
+from lxml import etree, html
+
+# Tags cuyo texto BeautifulSoup no incluye en get_text()
+NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def _parse(content: bytes):
+    """Parsear el HTML respetando el charset declarado (utf-8 por defecto)"""
+    match = CHARSET_RE.search(content[:4096])
+    encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    parser = html.HTMLParser(encoding=encoding)
+    return html.document_fromstring(content, parser=parser)
+
+
+def _classes(el) -> List[str]:
+    return el.get('class', '').split()
+
+
+def _strings(el, skip: Optional[set] = None) -> Iterator[str]:
+    """Textos del subárbol en orden de documento, como _all_strings de bs4"""
+    if el.text and el.tag not in NON_TEXT_TAGS:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and not (skip and child in skip):
+            yield from _strings(child, skip)
+        # El texto que sigue a un nodo sobrevive aunque se omita el nodo (decompose)
+        if child.tail:
+            yield child.tail
+
+
+def _text(el, separator: str = '', strip: bool = False, skip: Optional[set] = None) -> str:
+    """Equivalente a Tag.get_text(separator, strip)"""
+    if strip:
+        return separator.join(s.strip() for s in _strings(el, skip) if s.strip())
+    return separator.join(_strings(el, skip))
+
+
+def _find(el, tag: str, cls: Optional[str] = None, **attrs):
+    """Primer descendiente que cumple tag/clase/atributos (Tag.find)"""
+    for node in el.iterdescendants(tag):
+        if cls and cls not in _classes(node):
+            continue
+        if all(node.get(key) == value for key, value in attrs.items()):
+            return node
+    return None
+
+
+def _find_all(el, tags, cls: Optional[str] = None) -> list:
+    """Todos los descendientes que cumplen tag/clase (Tag.find_all)"""
+    return [
+        node for node in el.iterdescendants(*tags)
+        if not cls or cls in _classes(node)
+    ]
+
+
+def _next_sibling_tag(el, tag: Optional[str] = None):
+    """Siguiente hermano elemento, omitiendo comentarios (find_next_sibling)"""
+    node = el.getnext()
+    while node is not None:
+        if isinstance(node.tag, str) and (tag is None or node.tag == tag):
+            return node
+        node = node.getnext()
+    return None
+
+
+def _extract_location(location_element) -> str:
+    """Texto de ubicación/modalidad sin los elementos ocultos"""
+    hidden = {
+        node for node in location_element.iterdescendants()
+        if isinstance(node.tag, str)
+        and {'hide', 'location-tooltip-content'} & set(_classes(node))
+    }
+    # Todo el subárbol de un elemento oculto se descarta
+    removed = set(hidden)
+    for node in hidden:
+        removed.update(node.iterdescendants())
+
+    # Caso 1: Con link (Santiago)
+    location_link = next(
+        (a for a in location_element.iterdescendants('a') if a not in removed),
+        None
+    )
+    if location_link is not None:
+        location_text = _text(location_link, strip=True)
+        # next_sibling de bs4 después de eliminar los ocultos
+        next_text = location_link.tail
+        if not next_text:
+            node = location_link.getnext()
+            while node is not None:
+                if node in hidden:
+                    if node.tail:
+                        next_text = node.tail
+                        break
+                    node = node.getnext()
+                    continue
+                if not isinstance(node.tag, str):
+                    next_text = node.text  # Comentario: bs4 lo trata como string
+                break
+        if next_text:
+            location_modality = location_text + ' ' + next_text.strip()
+        else:
+            parent_text = _text(location_element, separator=' ', strip=True, skip=hidden)
+            location_modality = ' '.join(parent_text.split())
+    else:
+        # Caso 2: Sin link (Remote)
+        location_modality = _text(location_element, separator=' ', strip=True, skip=hidden)
+        location_modality = ' '.join(location_modality.split())
+
+    return location_modality.replace('\xa0', ' ').strip()
+
+
+def extract_job_fields(content: bytes) -> dict:
+    """
+    Extraer los campos crudos de una oferta en una sola pasada sobre el árbol
+    Args: content: Bytes del HTML de la oferta
+    Returns: Diccionario con las claves de _extract_job_header_bs4 y _extract_job_body_bs4
+    """
+    root = _parse(content)
+
+    found = {}
+    sections_divs = []
+    perk_boxes = []
+    h2s = []
+    page_text = []
+
+    def first(key, node):
+        if key not in found:
+            found[key] = node
+
+    # Única pasada: texto completo (para el job_id) y nodos de interés
+    for event, node in etree.iterwalk(root, events=('start', 'end', 'comment', 'pi')):
+        if event in ('comment', 'pi'):
+            if node.tail:
+                page_text.append(node.tail)
+            continue
+        if event == 'end':
+            if node.tail and node is not root:
+                page_text.append(node.tail)
+            continue
+
+        tag = node.tag
+        if node.text and tag not in NON_TEXT_TAGS:
+            page_text.append(node.text)
+
+        itemprop = node.get('itemprop')
+        classes = _classes(node)
+
+        if itemprop:
+            if tag == 'time' and itemprop == 'datePosted':
+                first('date_posted', node)
+            elif tag == 'span' and itemprop in ('title', 'url', 'qualifications', 'employmentType', 'baseSalary'):
+                first(itemprop, node)
+            elif tag == 'strong' and itemprop == 'name':
+                first('name', node)
+            elif tag == 'div' and itemprop == 'description':
+                first('description', node)
+            elif tag == 'div' and itemprop == 'skills' and 'gb-tags' in classes:
+                first('skills', node)
+
+        if classes:
+            if 'location' in classes:
+                first('location', node)
+            if tag == 'div' and 'mb4' in classes:
+                sections_divs.append(node)
+            if 'size0' in classes and 'mt1' in classes:
+                first('meta_info', node)
+                if tag == 'div' and ' '.join(classes) == 'size0 mt1':
+                    first('meta_div', node)
+            if 'gb-fluid-boxes__item' in classes:
+                perk_boxes.append(node)
+
+        if tag == 'h2':
+            h2s.append(node)
+        elif tag == 'a' and node.get('id') == 'apply_bottom':
+            first('apply', node)
+
+    def text_of(key):
+        node = found.get(key)
+        return _text(node, strip=True) if node is not None else None
+
+    job_id_match = re.search(r'GETONBRD Job ID: (\d+)', ''.join(page_text))
+    date_tag = found.get('date_posted')
+
+    location_element = found.get('location')
+    location_modality = _extract_location(location_element) if location_element is not None else None
+
+    # Sueldo
+    salary_scope = found.get('baseSalary')
+    salary = {}
+    salary_type = None
+    if salary_scope is not None:
+        for key in ('minValue', 'maxValue', 'currency', 'unitText'):
+            tag = _find(salary_scope, 'span', itemprop=key)
+            salary[key] = tag.get('content') if tag is not None else None
+        salary_type_span = _find(salary_scope, 'span', cls='hide-on-small-mobile')
+        salary_type = _text(salary_type_span, strip=True).lower() if salary_type_span is not None else None
+
+    # Descripción de la empresa
+    company_description = ""
+    description_div = found.get('description')
+    if description_div is not None:
+        first_rich_txt = _find(description_div, 'div', cls='gb-rich-txt')
+        if first_rich_txt is not None:
+            descriptions = []
+            for elem in _find_all(first_rich_txt, ('p', 'div')):
+                text = _text(elem, strip=True)
+                if text and not any(disclaimer in text for disclaimer in ['getonbrd.com', 'Get on Board']):
+                    descriptions.append(text)
+            company_description = ' '.join(descriptions)
+
+    # Secciones textuales
+    sections = []
+    for div in sections_divs:
+        h3 = _find(div, 'h3')
+        content_div = _find(div, 'div', cls='gb-rich-txt')
+        if h3 is not None and content_div is not None:
+            sections.append({
+                'title': _text(h3, strip=True),
+                'content': _text(content_div, separator='\n', strip=True)
+            })
+
+    meta_info = found.get('meta_info')
+    meta_div = found.get('meta_div')
+
+    # Perks: strong dentro de cada caja, sin repetir y en orden de documento
+    perks = []
+    seen = set()
+    for box in perk_boxes:
+        for tag in box.iterdescendants('strong'):
+            if tag not in seen:
+                seen.add(tag)
+                perks.append(_text(tag, strip=True))
+
+    # Remote work policy
+    remote_policy = None
+    for h2 in h2s:
+        h2_text = _text(h2, strip=True)
+        if 'Remote work policy' in h2_text or 'Política de trabajo remoto' in h2_text:
+            next_elem = _next_sibling_tag(h2)
+            if next_elem is not None and next_elem.tag == 'p':
+                desc_elem = _next_sibling_tag(next_elem, 'p')
+                if desc_elem is not None:
+                    remote_policy = _text(desc_elem, strip=True)
+                    break
+
+    # Tags tecnológicos
+    technologies = []
+    skills_container = found.get('skills')
+    if skills_container is not None:
+        technologies = [_text(tag, strip=True) for tag in _find_all(skills_container, ('a',), cls='gb-tags__item')]
+
+    apply_btn = found.get('apply')
+
+    return {
+        'job_id': job_id_match.group(1) if job_id_match else "unknown",
+        'date_posted': date_tag.get('datetime') if date_tag is not None else None,
+        'job_title': text_of('title'),
+        'company_name': text_of('name'),
+        'company_url': text_of('url'),
+        'location_modality': location_modality,
+        'experience': text_of('qualifications'),
+        'employment_type': text_of('employmentType'),
+        'salary_disclosed': salary_scope is not None,
+        'salary_min': salary.get('minValue'),
+        'salary_max': salary.get('maxValue'),
+        'salary_currency': salary.get('currency'),
+        'salary_unit': salary.get('unitText'),
+        'salary_type': salary_type,
+        'company_description': company_description,
+        'sections': sections,
+        'meta_text': _text(meta_info) if meta_info is not None else "",
+        'meta_div_text': _text(meta_div) if meta_div is not None else None,
+        'perks': perks,
+        'remote_policy': remote_policy,
+        'technologies': technologies,
+        'apply_url': apply_btn.get('href') if apply_btn is not None else None,
+    }
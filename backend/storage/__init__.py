@@ -0,0 +1,37 @@
+# backend/storage/__init__.py
+
+"""
+Backends de almacenamiento del crawler
+config.STORAGE_BACKEND elige la implementación: 'sqlite' (database.py) o 'postgres'
+"""
+
+from config import STORAGE_BACKEND, POSTGRES_DSN
+from storage.base import Storage
+
+# Una instancia por backend y proceso (el de postgres mantiene su pool de conexiones)
+_storages = {}
+
+
+def get_storage(backend: str = None) -> Storage:
+    """
+    Obtener el backend de almacenamiento configurado
+    Args: backend: 'sqlite' o 'postgres' (None = STORAGE_BACKEND)
+    """
+    backend = backend or STORAGE_BACKEND
+    if backend not in _storages:
+        if backend == 'sqlite':
+            from storage.sqlite import SQLiteStorage
+            _storages[backend] = SQLiteStorage()
+        elif backend == 'postgres':
+            from storage.postgres import PostgresStorage
+            _storages[backend] = PostgresStorage(POSTGRES_DSN)
+        else:
+            raise ValueError(f"Backend de almacenamiento desconocido: {backend} (usar 'sqlite' o 'postgres')")
+    return _storages[backend]
+
+
+def close_storages():
+    """Cerrar los backends abiertos (llamar al terminar el proceso)"""
+    for storage in _storages.values():
+        storage.close()
+    _storages.clear()
@@ -0,0 +1,93 @@
+# backend/storage/base.py
+
+"""
+Interfaz común de los backends de almacenamiento
+Cubre lo que usa el scraping: URLs de los listados, ofertas y su estado de
+procesamiento. La clasificación de secciones, la búsqueda full-text y la
+compresión de textos son propias de SQLite y siguen en database.py
+"""
+
+from abc import ABC, abstractmethod
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+from config import READ_CHUNK_SIZE
+from database import JobOfferWriter
+
+
+class Storage(ABC):
+    """Operaciones de almacenamiento que cada backend debe implementar"""
+
+    @abstractmethod
+    def create_tables(self):
+        """Crear/verificar las tablas del backend"""
+
+    @abstractmethod
+    def get_all_urls(self) -> List[str]:
+        """Obtener todas las URLs de trabajos ya guardadas"""
+
+    @abstractmethod
+    def insert_job_urls(self, jobs_data: List[Tuple[str, str, str]], portal: str) -> int:
+        """
+        Insertar URLs (las ya existentes se ignoran) en una sola transacción
+        Args:
+            jobs_data: Lista de tuplas (url, posted_date, category)
+            portal: Nombre del portal (ej: 'getonbrd.com')
+        Returns: Número de registros insertados
+        """
+
+    @abstractmethod
+    def count_job_urls(self, processed: Optional[bool] = None) -> int:
+        """Contar registros de job_urls (opcionalmente filtrados por estado)"""
+
+    @abstractmethod
+    def iter_job_urls(self, processed: Optional[bool] = None,
+                      chunk_size: int = READ_CHUNK_SIZE) -> Iterator:
+        """
+        Iterar registros de job_urls (acceso por nombre: row['id'], row['url']),
+        de los más recientes a los más antiguos, leyendo por páginas
+        """
+
+    def claim_job_urls(self, limit: Optional[int] = None) -> Iterator:
+        """
+        Iterar las URLs sin procesar que este proceso va a scrapear. Con un solo
+        escritor basta con leerlas; los backends compartidos por varios hosts las
+        reservan para que dos hosts no scrapeen la misma
+        Args: limit: Máximo de URLs (None = todas)
+        """
+        return islice(self.iter_job_urls(processed=False), limit)
+
+    @abstractmethod
+    def save_job_offers(self, batch: List[Tuple[dict, int]]) -> int:
+        """
+        Guardar ofertas nuevas y marcar sus URLs como procesadas en una transacción
+        Args: batch: Tuplas (datos del trabajo del scraper, id en job_urls)
+        Returns: Número de ofertas nuevas
+        """
+
+    @abstractmethod
+    def upsert_job_offers(self, jobs_data: List[dict]) -> int:
+        """
+        Insertar o actualizar ofertas pisando solo los campos del scraper
+        Returns: Número de filas insertadas o actualizadas
+        """
+
+    @abstractmethod
+    def get_job_count_by_portal(self) -> List[Tuple[str, int]]:
+        """Obtener conteo de trabajos por portal"""
+
+    @abstractmethod
+    def get_top_technologies(self, limit: int = 20, since: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Tecnologías más pedidas
+        Args: since: Solo ofertas publicadas desde esta fecha (YYYY-MM-DD)
+        Returns: Lista de (nombre, cantidad de ofertas)
+        """
+
+    @abstractmethod
+    def close(self):
+        """Liberar las conexiones del backend"""
+
+    def job_offer_writer(self, **kwargs) -> JobOfferWriter:
+        """Escritor en segundo plano que guarda los lotes con save_job_offers"""
+        return JobOfferWriter(save_batch=self.save_job_offers, **kwargs)
@@ -0,0 +1,223 @@
+# backend/storage/postgres.py
+
+"""
+Backend PostgreSQL, pensado para varios crawlers escribiendo a la vez
+- Pool de conexiones (psycopg_pool): cada operación toma una conexión y la devuelve
+- Cargas masivas con COPY a una tabla temporal y desde ahí INSERT ... ON CONFLICT:
+  si dos hosts guardan la misma URL u oferta no hay error ni filas duplicadas
+- Las URLs a scrapear se reservan por lotes (claimed_at) para que cada host tome las suyas
+"""
+
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from config import (
+    READ_CHUNK_SIZE,
+    POSTGRES_SCHEMA,
+    POSTGRES_POOL_MIN_SIZE,
+    POSTGRES_POOL_MAX_SIZE,
+    POSTGRES_CLAIM_BATCH_SIZE,
+    POSTGRES_CLAIM_LEASE_MINUTES,
+    JOB_OFFER_INSERT_COLUMNS,
+    JOB_OFFER_SCRAPED_COLUMNS,
+)
+from database import _job_offer_values
+from storage.base import Storage
+
+try:
+    import psycopg
+    from psycopg.rows import dict_row
+    from psycopg_pool import ConnectionPool
+except ImportError:  # Dependencia opcional: solo se usa con STORAGE_BACKEND = 'postgres'
+    psycopg = None
+
+JOB_URL_COLUMNS = ["url", "posted_date", "portal", "category", "scraped_at", "processed"]
+
+
+def _copy_to_staging(cursor, table: str, columns: List[str], rows) -> str:
+    """
+    Cargar filas con COPY en una tabla temporal con las columnas indicadas de
+    table; la tabla se elimina al terminar la transacción
+    Returns: Nombre de la tabla temporal
+    """
+    staging = f"{table}_staging"
+    column_list = ', '.join(columns)
+    cursor.execute(
+        f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA"
+    )
+    with cursor.copy(f"COPY {staging} ({column_list}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+    return staging
+
+
+def _job_offer_row(job_data: dict) -> tuple:
+    """Valores de JOB_OFFER_INSERT_COLUMNS; los bool van como 0/1, igual que en SQLite"""
+    return tuple(int(value) if isinstance(value, bool) else value for value in _job_offer_values(job_data))
+
+
+class PostgresStorage(Storage):
+    """Almacenamiento en PostgreSQL (POSTGRES_DSN)"""
+
+    def __init__(self, dsn: str, min_size: int = POSTGRES_POOL_MIN_SIZE, max_size: int = POSTGRES_POOL_MAX_SIZE):
+        if psycopg is None:
+            raise RuntimeError("STORAGE_BACKEND = 'postgres' requiere los paquetes 'psycopg' y 'psycopg-pool'")
+        self._pool = ConnectionPool(
+            dsn, min_size=min_size, max_size=max_size,
+            kwargs={'row_factory': dict_row}, open=True
+        )
+
+    def create_tables(self):
+        with self._pool.connection() as conn:
+            # Serializa la creación si varios hosts arrancan a la vez
+            conn.execute("SELECT pg_advisory_xact_lock(hashtext('jobradar_schema'))")
+            for statement in POSTGRES_SCHEMA:
+                conn.execute(statement)
+        print("Tablas creadas/verificadas en PostgreSQL")
+
+    def get_all_urls(self) -> List[str]:
+        with self._pool.connection() as conn:
+            return [row['url'] for row in conn.execute("SELECT url FROM job_urls")]
+
+    def insert_job_urls(self, jobs_data: List[Tuple[str, str, str]], portal: str) -> int:
+        if not jobs_data:
+            return 0
+
+        scraped_at = datetime.now()
+        columns = ', '.join(JOB_URL_COLUMNS)
+        with self._pool.connection() as conn, conn.cursor() as cursor:
+            staging = _copy_to_staging(cursor, "job_urls", JOB_URL_COLUMNS, (
+                (url, posted_date, portal, category, scraped_at, False)
+                for url, posted_date, category in jobs_data
+            ))
+            cursor.execute(f"""
+                INSERT INTO job_urls ({columns})
+                SELECT DISTINCT ON (url) {columns} FROM {staging}
+                ON CONFLICT (url) DO NOTHING
+            """)
+            inserted = cursor.rowcount
+
+        print(f"Insertados {inserted} registros en DB")
+        return inserted
+
+    def count_job_urls(self, processed: Optional[bool] = None) -> int:
+        with self._pool.connection() as conn:
+            if processed is None:
+                row = conn.execute("SELECT COUNT(*) AS count FROM job_urls").fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT COUNT(*) AS count FROM job_urls WHERE processed = %s", (processed,)
+                ).fetchone()
+            return row['count']
+
+    def iter_job_urls(self, processed: Optional[bool] = None,
+                      chunk_size: int = READ_CHUNK_SIZE) -> Iterator[dict]:
+        # Keyset por id descendente; cada página usa una conexión del pool y la devuelve
+        condition = "" if processed is None else " AND processed = %s"
+        params = () if processed is None else (processed,)
+        query = f"SELECT * FROM job_urls WHERE id < %s{condition} ORDER BY id DESC LIMIT %s"
+
+        last_id = 2 ** 63 - 1
+        while True:
+            with self._pool.connection() as conn:
+                rows = conn.execute(query, (last_id, *params, chunk_size)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1]['id']
+
+    def claim_job_urls(self, limit: Optional[int] = None,
+                       batch_size: int = POSTGRES_CLAIM_BATCH_SIZE,
+                       lease_minutes: int = POSTGRES_CLAIM_LEASE_MINUTES) -> Iterator[dict]:
+        # Reserva por lotes con FOR UPDATE SKIP LOCKED: los hosts que reservan a la vez
+        # se saltan las filas del otro. claimed_at hace de lease: si el host cae (o la
+        # URL falla) la fila vuelve a estar disponible pasados lease_minutes
+        query = """
+            UPDATE job_urls SET claimed_at = now()
+            WHERE id IN (
+                SELECT id FROM job_urls
+                WHERE NOT processed
+                  AND (claimed_at IS NULL OR claimed_at < now() - make_interval(mins => %s))
+                ORDER BY id DESC
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+        """
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            with self._pool.connection() as conn:
+                rows = conn.execute(query, (lease_minutes, size)).fetchall()
+            if not rows:
+                return
+            # RETURNING no garantiza orden: de las más recientes a las más antiguas
+            rows.sort(key=lambda row: row['id'], reverse=True)
+            yield from rows
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def _write_job_offers(self, cursor, jobs_data: List[dict], upsert: bool = False) -> int:
+        """COPY de las ofertas y paso a job_offers; con upsert se pisan solo los campos del scraper"""
+        columns = ', '.join(JOB_OFFER_INSERT_COLUMNS)
+        if upsert:
+            conflict = "DO UPDATE SET " + ", ".join(
+                f"{column} = EXCLUDED.{column}" for column in JOB_OFFER_SCRAPED_COLUMNS
+            )
+        else:
+            conflict = "DO NOTHING"
+
+        staging = _copy_to_staging(cursor, "job_offers", JOB_OFFER_INSERT_COLUMNS,
+                                   (_job_offer_row(job_data) for job_data in jobs_data))
+        # DISTINCT ON: ON CONFLICT no admite dos filas del mismo lote con igual job_id
+        cursor.execute(f"""
+            INSERT INTO job_offers ({columns})
+            SELECT DISTINCT ON (job_id) {columns} FROM {staging}
+            ON CONFLICT (job_id) {conflict}
+        """)
+        return cursor.rowcount
+
+    def save_job_offers(self, batch: List[Tuple[dict, int]]) -> int:
+        with self._pool.connection() as conn, conn.cursor() as cursor:
+            inserted = self._write_job_offers(cursor, [job_data for job_data, _ in batch])
+            cursor.execute(
+                "UPDATE job_urls SET processed = TRUE, claimed_at = NULL WHERE id = ANY(%s)",
+                ([job_url_id for _, job_url_id in batch],)
+            )
+        return inserted
+
+    def upsert_job_offers(self, jobs_data: List[dict]) -> int:
+        if not jobs_data:
+            return 0
+        with self._pool.connection() as conn, conn.cursor() as cursor:
+            return self._write_job_offers(cursor, jobs_data, upsert=True)
+
+    def get_job_count_by_portal(self) -> List[Tuple[str, int]]:
+        with self._pool.connection() as conn:
+            rows = conn.execute("SELECT portal, COUNT(*) AS count FROM job_urls GROUP BY portal").fetchall()
+        return [(row['portal'], row['count']) for row in rows]
+
+    def get_top_technologies(self, limit: int = 20, since: Optional[str] = None) -> List[Tuple[str, int]]:
+        # Sin tablas de enlace: se expande el JSON de tech_stack_raw (misma clave que _technology_key)
+        condition = " AND o.posted_date >= %s" if since else ""
+        params = (since, limit) if since else (limit,)
+        with self._pool.connection() as conn:
+            rows = conn.execute(f"""
+                SELECT MIN(tech.name) AS name, COUNT(DISTINCT o.id) AS count
+                FROM job_offers o
+                CROSS JOIN LATERAL jsonb_array_elements_text(o.tech_stack_raw::jsonb) AS raw(name)
+                CROSS JOIN LATERAL (
+                    SELECT BTRIM(regexp_replace(raw.name, '[[:space:]]+', ' ', 'g')) AS name
+                ) AS tech
+                WHERE tech.name <> ''{condition}
+                GROUP BY LOWER(tech.name)
+                ORDER BY count DESC
+                LIMIT %s
+            """, params).fetchall()
+        return [(row['name'], row['count']) for row in rows]
+
+    def close(self):
+        self._pool.close()
@@ -0,0 +1,46 @@
+# backend/storage/sqlite.py
+
+"""
+Backend SQLite: delega en las funciones de database.py
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+import database
+from config import READ_CHUNK_SIZE
+from storage.base import Storage
+
+
+class SQLiteStorage(Storage):
+    """Almacenamiento en el archivo SQLite local (DB_PATH)"""
+
+    def create_tables(self):
+        database.create_tables()
+
+    def get_all_urls(self) -> List[str]:
+        return database.get_all_urls()
+
+    def insert_job_urls(self, jobs_data: List[Tuple[str, str, str]], portal: str) -> int:
+        return database.insert_job_urls_bulk(jobs_data, portal=portal)
+
+    def count_job_urls(self, processed: Optional[bool] = None) -> int:
+        return database.count_job_urls(processed)
+
+    def iter_job_urls(self, processed: Optional[bool] = None,
+                      chunk_size: int = READ_CHUNK_SIZE) -> Iterator:
+        return database.iter_job_urls(processed, chunk_size)
+
+    def save_job_offers(self, batch: List[Tuple[dict, int]]) -> int:
+        return database.save_job_offer_batch(batch)
+
+    def upsert_job_offers(self, jobs_data: List[dict]) -> int:
+        return database.upsert_job_offers(jobs_data)
+
+    def get_job_count_by_portal(self) -> List[Tuple[str, int]]:
+        return [tuple(row) for row in database.get_job_count_by_portal()]
+
+    def get_top_technologies(self, limit: int = 20, since: Optional[str] = None) -> List[Tuple[str, int]]:
+        return database.get_top_technologies(limit, since)
+
+    def close(self):
+        database.close_db_connections()
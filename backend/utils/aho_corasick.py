@@ -0,0 +1,95 @@
+# backend/utils/aho_corasick.py
+
+"""
+Autómata Aho-Corasick para buscar muchos patrones a la vez
+Se construye una vez y recorre el texto en una sola pasada, en tiempo lineal
+respecto al largo del texto más la cantidad de coincidencias
+"""
+
+from collections import deque
+from typing import Any, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class AhoCorasick:
+    """Buscador multi-patrón: cada patrón lleva un valor asociado (ej: su categoría)"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]]):
+        """
+        Args: patterns: Pares (patrón, valor). Los patrones vacíos se ignoran y
+              los repetidos conservan el primer valor
+        """
+        self._goto = [{}]       # Transiciones por nodo: char -> nodo
+        self._fail = [0]        # Enlace de falla por nodo
+        self._output = [[]]     # Patrones que terminan en el nodo: (largo, valor)
+
+        for pattern, value in patterns:
+            if pattern:
+                self._add(pattern, value)
+        self._build_failure_links()
+
+    def _add(self, pattern: str, value: Any):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        if not self._output[node]:
+            self._output[node].append((len(pattern), value))
+
+    def _build_failure_links(self):
+        """BFS: el enlace de falla apunta al sufijo propio más largo que es prefijo de algún patrón"""
+        # Los hijos de la raíz fallan a la raíz (ya inicializados en 0)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                # Los patrones que terminan en el sufijo también terminan aquí
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Recorrer todas las coincidencias (incluye solapadas)
+        Yields: (inicio, fin, valor) con fin exclusivo
+        """
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for length, value in self._output[node]:
+                yield index + 1 - length, index + 1, value
+
+    def find_words(self, text: str) -> List[Tuple[int, int, Any]]:
+        """
+        Coincidencias que calzan con palabras completas, sin solaparse
+        (ante solapamiento gana la que empieza antes y, a igual inicio, la más larga)
+        Returns: Lista de (inicio, fin, valor) ordenada por posición
+        """
+        matches = [
+            (start, end, value) for start, end, value in self.iter_matches(text)
+            if (start == 0 or not _is_word_char(text[start - 1]))
+            and (end == len(text) or not _is_word_char(text[end]))
+        ]
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+
+        selected = []
+        last_end = 0
+        for start, end, value in matches:
+            if start >= last_end:
+                selected.append((start, end, value))
+                last_end = end
+        return selected
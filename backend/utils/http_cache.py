@@ -0,0 +1,179 @@
+# backend/utils/http_cache.py
+
+"""
+Cache HTTP en disco con revalidación condicional (ETag / Last-Modified)
+Cada entrada guarda el body y sus validadores; la expulsión es por edad y tamaño total
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+
+
+class HttpCache:
+    """Cache de responses en disco, compartida entre hilos"""
+
+    def __init__(self, path: str, max_age_days: int, max_bytes: int):
+        self.path = path
+        self.max_age = max_age_days * 24 * 3600
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._total_bytes = self.evict()
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def _body_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.body")
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        Obtener la metadata de una entrada vigente
+        Returns: Diccionario con url, etag, last_modified, stored_at y size, o None
+        """
+        meta_path = self._meta_path(self._key(url))
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - meta.get('stored_at', 0) > self.max_age:
+            return None
+        return meta
+
+    def iter_entries(self):
+        """Iterar la metadata de todas las entradas vigentes"""
+        for name in os.listdir(self.path):
+            if name.endswith('.json'):
+                with open(os.path.join(self.path, name), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if time.time() - meta.get('stored_at', 0) <= self.max_age:
+                    yield meta
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        """Leer el body guardado de una URL"""
+        try:
+            with open(self._body_path(self._key(url)), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def conditional_headers(self, url: str) -> dict:
+        """Headers If-None-Match / If-Modified-Since para revalidar una URL cacheada"""
+        meta = self.get(url)
+        if not meta:
+            return {}
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url: str, response: requests.Response, body: Optional[bytes] = None):
+        """
+        Guardar un response 200 si trae validadores para revalidarlo después
+        Args:
+            url: URL descargada
+            response: Response con los headers ETag / Last-Modified
+            body: Body ya leído (para responses en modo stream); por defecto response.content
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+
+        key = self._key(url)
+        if body is None:
+            body = response.content
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'size': len(body),
+        }
+
+        # Escritura atómica: primero a un temporal, luego rename
+        suffix = f".{threading.get_ident()}.tmp"
+        body_path = self._body_path(key)
+        meta_path = self._meta_path(key)
+        with open(body_path + suffix, 'wb') as f:
+            f.write(body)
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(body_path + suffix, body_path)
+        os.replace(meta_path + suffix, meta_path)
+
+        with self._lock:
+            self._total_bytes += len(body)
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._total_bytes = self.evict()
+
+    def touch(self, url: str):
+        """Renovar una entrada revalidada con 304 (edad y posición LRU)"""
+        key = self._key(url)
+        meta = self.get(url)
+        if not meta:
+            return
+        meta['stored_at'] = time.time()
+        meta_path = self._meta_path(key)
+        suffix = f".{threading.get_ident()}.tmp"
+        with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + suffix, meta_path)
+
+    def evict(self) -> int:
+        """
+        Eliminar entradas vencidas y, si se supera max_bytes, las menos usadas
+        Returns: Tamaño total en bytes que queda en la cache
+        """
+        with self._lock:
+            now = time.time()
+            entries = []
+            for name in os.listdir(self.path):
+                if not name.endswith('.json'):
+                    continue
+                key = name[:-len('.json')]
+                meta_path = self._meta_path(key)
+                body_path = self._body_path(key)
+                try:
+                    mtime = os.path.getmtime(meta_path)
+                    size = os.path.getsize(body_path)
+                except OSError:
+                    self._remove(key)
+                    continue
+
+                if now - mtime > self.max_age:
+                    self._remove(key)
+                else:
+                    entries.append((mtime, size, key))
+
+            total = sum(size for _, size, _ in entries)
+            # LRU: las entradas con mtime más antiguo salen primero
+            for mtime, size, key in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(key)
+                total -= size
+
+            return total
+
+    def _remove(self, key: str):
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
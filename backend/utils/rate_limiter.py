@@ -0,0 +1,117 @@
+# backend/utils/rate_limiter.py
+
+"""
+Control de concurrencia y ritmo de requests para los scrapers
+Limita las conexiones simultáneas por host y ajusta las requests por segundo
+con AIMD: sube de a poco mientras el sitio responde bien y retrocede
+multiplicativamente ante 429, timeouts o latencia en alza
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+# Status que indican que el sitio nos está frenando
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class AdaptiveRateLimiter:
+    """Ritmo global de requests/segundo ajustado con AIMD, compartido entre hilos"""
+
+    def __init__(self, initial_rate: float, min_rate: float, max_rate: float,
+                 increase: float, decrease_factor: float, latency_factor: float,
+                 latency_floor: float, cooldown: float, log_every: int = 25):
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.latency_floor = latency_floor
+        self.cooldown = cooldown
+        self.log_every = log_every
+        self.baseline_latency = None
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._last_backoff_at = 0.0
+        self._responses = 0
+
+    def acquire(self):
+        """Esperar hasta el siguiente turno libre según el ritmo actual"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1.0 / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+    def record(self, status: Optional[int], latency: float, throttled: bool = False):
+        """
+        Registrar el resultado de una request y ajustar el ritmo
+        Args:
+            status: Status HTTP final (None si hubo timeout o error de conexión)
+            latency: Segundos hasta recibir la respuesta
+            throttled: True si hubo señales de throttling ocultas (ej: 429 reintentado)
+        """
+        with self._lock:
+            self._responses += 1
+            reason = None
+            if status is None:
+                reason = "timeout/error de conexión"
+            elif throttled or status in THROTTLE_STATUS_CODES:
+                reason = f"status {status}" if status in THROTTLE_STATUS_CODES else "reintentos por throttling"
+            elif self.baseline_latency and latency > max(self.baseline_latency * self.latency_factor, self.latency_floor):
+                reason = f"latencia {latency:.2f}s (base {self.baseline_latency:.2f}s)"
+
+            if reason:
+                self._backoff(reason)
+                return
+
+            # Respuesta sana: aumento aditivo y actualización de la latencia base
+            self.baseline_latency = latency if self.baseline_latency is None else 0.9 * self.baseline_latency + 0.1 * latency
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            if self._responses % self.log_every == 0:
+                print(f"[rate] {self.rate:.2f} req/s (latencia base {self.baseline_latency:.2f}s)")
+
+    def _backoff(self, reason: str):
+        """Retroceso multiplicativo, como máximo uno por ventana de cooldown"""
+        now = time.monotonic()
+        if now - self._last_backoff_at < self.cooldown:
+            return
+        self._last_backoff_at = now
+        previous = self.rate
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        # El próximo turno respeta el nuevo intervalo
+        self._next_request_at = max(self._next_request_at, now + 1.0 / self.rate)
+        print(f"[rate] ↓ {previous:.2f} -> {self.rate:.2f} req/s ({reason})")
+
+
+class HostThrottle:
+    """Tope de requests simultáneas por host y ritmo global adaptativo"""
+
+    def __init__(self, max_per_host: int, limiter: AdaptiveRateLimiter):
+        self.max_per_host = max(1, max_per_host)
+        self.limiter = limiter
+        self._lock = threading.Lock()
+        self._host_slots = {}
+
+    def _host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        """Obtener (o crear) el semáforo del host de la URL"""
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._host_slots[host]
+
+    @contextmanager
+    def slot(self, url: str):
+        """Context manager que reserva un cupo del host y respeta el ritmo global"""
+        semaphore = self._host_semaphore(url)
+        semaphore.acquire()
+        try:
+            self.limiter.acquire()
+            yield
+        finally:
+            semaphore.release()
@@ -0,0 +1,118 @@
+# backend/utils/raw_archive.py
+
+"""
+Archivo de HTML crudo direccionado por contenido
+Guarda los bytes originales de cada response comprimidos (zstd o gzip) y con
+nombre igual a su hash, de modo que páginas idénticas se guardan una sola vez.
+El índice (url, job_id, fetched_at) -> blob vive en la tabla raw_pages.
+"""
+
+import gzip
+import hashlib
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Optional
+
+from database import insert_raw_pages
+
+try:
+    import zstandard
+except ImportError:  # Dependencia opcional: sin ella se usa gzip
+    zstandard = None
+
+EXTENSIONS = {'zstd': '.html.zst', 'gzip': '.html.gz'}
+
+
+def blob_path(archive_path: str, content_hash: str, compression: str) -> str:
+    """Ruta del blob: <archivo>/blobs/<2 primeros chars>/<hash><ext>"""
+    return os.path.join(archive_path, 'blobs', content_hash[:2], content_hash + EXTENSIONS[compression])
+
+
+def read_blob(archive_path: str, content_hash: str, compression: str) -> bytes:
+    """Leer y descomprimir un blob del archivo"""
+    with open(blob_path(archive_path, content_hash, compression), 'rb') as f:
+        data = f.read()
+    if compression == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("El blob está en zstd y el paquete 'zstandard' no está instalado")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class RawArchive:
+    """Escritor en segundo plano del archivo de HTML crudo"""
+
+    def __init__(self, path: str, compression: str = 'zstd', batch_size: int = 100):
+        if compression == 'zstd' and zstandard is None:
+            print("⚠ 'zstandard' no está instalado, el archivo HTML usará gzip")
+            compression = 'gzip'
+        self.path = path
+        self.compression = compression
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name="raw-archive", daemon=True)
+        self._thread.start()
+
+    def put(self, url: str, content: bytes, job_id: Optional[str] = None):
+        """
+        Encolar una página para archivar (no bloquea al scraper)
+        Args:
+            url: URL descargada
+            content: Bytes originales del response
+            job_id: ID de la oferta si se conoce
+        """
+        fetched_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self._queue.put((url, content, job_id, fetched_at))
+
+    def close(self):
+        """Vaciar la cola pendiente y detener el hilo escritor"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return gzip.compress(content, compresslevel=6)
+
+    def _write_blob(self, content: bytes) -> str:
+        """Escribir el blob si no existe aún. Returns: hash del contenido"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = blob_path(self.path, content_hash, self.compression)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(self._compress(content))
+            os.replace(tmp_path, path)
+        return content_hash
+
+    def _worker(self):
+        running = True
+        while running:
+            # Bloquear por el primer item y luego tomar lo que haya en cola
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = []
+            for item in items:
+                if item is None:
+                    running = False
+                    continue
+                url, content, job_id, fetched_at = item
+                try:
+                    content_hash = self._write_blob(content)
+                    rows.append((url, job_id, content_hash, self.compression, len(content), fetched_at))
+                except OSError as e:
+                    print(f"Error archivando {url}: {e}")
+
+            if rows:
+                try:
+                    insert_raw_pages(rows)
+                except Exception as e:
+                    print(f"Error guardando índice del archivo HTML: {e}")
@@ -1,11 +1,26 @@
 # backend/utils/section_classifier.py
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 from .section_patterns import SECTION_PATTERNS
-from typing import Optional
+from .aho_corasick import AhoCorasick
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import hashlib
+import json
 import unicodedata
 import re
 
+# Subir al cambiar la lógica de clasificación (fuerza reclasificar todo)
+CLASSIFIER_REVISION = 2
+
+# Clasificación por contenido (segunda etapa cuando el título no calza)
+CONTENT_MIN_HITS = 2            # Coincidencias mínimas de la categoría ganadora
+CONTENT_MIN_DENSITY = 1.0       # Coincidencias mínimas por cada 100 palabras
+
+# Títulos normalizados recordados en memoria por cada SectionClassifier (LRU)
+TITLE_CACHE_SIZE = 10000
+
 def normalize_text(text: str) -> str:
     """Normaliza el texto removiendo emojis, acentos y caracteres especiales."""
     # AGREGAR ESTA LÍNEA: Remover emojis y caracteres especiales
@@ -16,10 +31,259 @@ def normalize_text(text: str) -> str:
                    if unicodedata.category(c) != 'Mn')
     return text.lower().strip()
 
+def _prepare_text(texto: str) -> str:
+    """Normalizar y, si el texto es muy largo, quedarse con las primeras 50 palabras"""
+    texto_norm = normalize_text(texto)
+    # Si el texto es muy largo, probablemente es solo contenido
+    if len(texto_norm) > 100:
+        texto_norm = ' '.join(texto_norm.split()[:50])
+    return texto_norm
+
+
+class SectionClassifier:
+    """
+    Clasificador de secciones con los patrones normalizados una sola vez.
+    Da los mismos resultados que recorrer SECTION_PATTERNS con partial_ratio
+    (gana el primer patrón con el mejor puntaje), pero resuelve sin fuzzy:
+      - Coincidencia exacta con un patrón: índice hash
+      - Un patrón contenido en el texto o al revés (partial_ratio = 100):
+        el primero en orden, sin seguir buscando
+    y solo si no hay contención usa process.extractOne sobre los patrones.
+    Los resultados se memorizan por título normalizado en una cache LRU que
+    se puede precargar/persistir (ver preload y drain_unsaved).
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]] = SECTION_PATTERNS, min_score: int = 70,
+                 cache_size: int = TITLE_CACHE_SIZE):
+        self.min_score = min_score
+        # Identifica patrones + parámetros: una cache persistida solo vale para esta versión
+        self.version = classifier_version(min_score, patterns)
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()   # título normalizado -> categoría
+        self._unsaved = {}            # resultados nuevos aún no persistidos
+        self._automaton = None        # AhoCorasick de los patrones (se arma al primer uso)
+        # Patrones normalizados en el orden original, con su categoría
+        self.choices = []
+        self.categories = []
+        for categoria, patrones in patterns.items():
+            for patron in patrones:
+                self.choices.append(normalize_text(patron))
+                self.categories.append(categoria)
+
+        # Índice exacto: cada patrón resuelto con la misma regla de contención
+        self.exact = {}
+        for patron_norm in self.choices:
+            if patron_norm and patron_norm not in self.exact:
+                self.exact[patron_norm] = self._containment_match(patron_norm)
+
+    def _cache_get(self, texto_norm: str):
+        """Returns: (encontrado, categoría) y actualiza los contadores"""
+        if texto_norm in self._cache:
+            self._cache.move_to_end(texto_norm)
+            self.hits += 1
+            return True, self._cache[texto_norm]
+        self.misses += 1
+        return False, None
+
+    def _cache_put(self, texto_norm: str, categoria: Optional[str], persist: bool = True):
+        self._cache[texto_norm] = categoria
+        self._cache.move_to_end(texto_norm)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        if persist:
+            self._unsaved[texto_norm] = categoria
+
+    def preload(self, entries: Dict[str, Optional[str]]) -> int:
+        """
+        Cargar resultados ya calculados (ej: desde la BD) a la cache
+        Args: entries: Título normalizado -> categoría, calculados con self.version
+        Returns: Número de entradas cargadas
+        """
+        for texto_norm, categoria in entries.items():
+            self._cache_put(texto_norm, categoria, persist=False)
+        return len(entries)
+
+    def drain_unsaved(self) -> Dict[str, Optional[str]]:
+        """Entregar (y olvidar) los resultados calculados desde el último drain"""
+        unsaved, self._unsaved = self._unsaved, {}
+        return unsaved
+
+    def cache_info(self) -> dict:
+        """Contadores de la cache de títulos"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._cache),
+            'max_size': self.cache_size,
+        }
+
+    def _containment_match(self, texto_norm: str) -> Optional[str]:
+        """Categoría del primer patrón que contiene o está contenido en el texto"""
+        for patron_norm, categoria in zip(self.choices, self.categories):
+            if patron_norm and (patron_norm in texto_norm or texto_norm in patron_norm):
+                return categoria
+        return None
+
+    def classify(self, texto: str) -> Optional[str]:
+        """
+        Clasifica un texto en una categoría de sección.
+        Parámetros: texto (str): Texto a clasificar (idealmente el título)
+        Retorna: str | None: Nombre de la categoría o None si no hay match
+        """
+        if not texto:
+            return None
+
+        texto_norm = _prepare_text(texto)
+        if not texto_norm:
+            return None  # partial_ratio contra un texto vacío es 0
+
+        found, categoria = self._cache_get(texto_norm)
+        if found:
+            return categoria
+
+        categoria = self._classify_normalized(texto_norm)
+        self._cache_put(texto_norm, categoria)
+        return categoria
+
+    def _classify_normalized(self, texto_norm: str) -> Optional[str]:
+        if texto_norm in self.exact:
+            return self.exact[texto_norm]
+
+        categoria = self._containment_match(texto_norm)
+        if categoria:
+            return categoria
+
+        match = process.extractOne(texto_norm, self.choices, scorer=fuzz.partial_ratio,
+                                   score_cutoff=self.min_score)
+        return self.categories[match[2]] if match else None
+
+    def classify_content(self, contenido: str) -> Optional[str]:
+        """
+        Clasificar una sección por su contenido: busca todos los patrones como
+        palabras completas en una sola pasada (Aho-Corasick) y elige la categoría
+        con más coincidencias, si supera CONTENT_MIN_HITS y CONTENT_MIN_DENSITY
+        Parámetros: contenido (str): Cuerpo de la sección (sin truncar)
+        Retorna: str | None: Nombre de la categoría o None si no hay evidencia suficiente
+        """
+        if not contenido:
+            return None
+        if self._automaton is None:
+            self._automaton = AhoCorasick(zip(self.choices, self.categories))
+
+        texto_norm = normalize_text(contenido)
+        hits = {}
+        for _, _, categoria in self._automaton.find_words(texto_norm):
+            hits[categoria] = hits.get(categoria, 0) + 1
+        if not hits:
+            return None
+
+        # A igual cantidad gana la categoría que aparece primero en los patrones
+        order = {categoria: index for index, categoria in enumerate(dict.fromkeys(self.categories))}
+        categoria = max(hits, key=lambda c: (hits[c], -order[c]))
+        words = max(1, len(texto_norm.split()))
+        if hits[categoria] < CONTENT_MIN_HITS or hits[categoria] * 100 / words < CONTENT_MIN_DENSITY:
+            return None
+        return categoria
+
+    def classify_batch(self, textos: List[str], workers: int = -1) -> List[Optional[str]]:
+        """
+        Clasificar muchos textos a la vez. Los que no resuelven por índice o
+        contención se puntúan juntos con process.cdist (textos x patrones, en
+        todos los cores) y se elige el argmax de cada fila.
+        Parámetros:
+            textos (list): Textos a clasificar
+            workers (int): Hilos de cdist (-1 = todos los cores)
+        Retorna: Lista de categorías (o None) en el mismo orden
+        """
+        results = {}   # texto normalizado -> categoría
+        fuzzy = []     # textos normalizados que requieren puntaje
+        normalized = []
+        for texto in textos:
+            texto_norm = _prepare_text(texto) if texto else ''
+            normalized.append(texto_norm)
+            if texto_norm in results:
+                if texto_norm:
+                    self.hits += 1  # Repetido dentro del mismo lote
+                continue
+            if not texto_norm:
+                results[texto_norm] = None
+                continue
+
+            found, categoria = self._cache_get(texto_norm)
+            if found:
+                results[texto_norm] = categoria
+                continue
+
+            if texto_norm in self.exact:
+                categoria = self.exact[texto_norm]
+            else:
+                categoria = self._containment_match(texto_norm)
+                if not categoria:
+                    fuzzy.append(texto_norm)
+            results[texto_norm] = categoria
+            if categoria:
+                self._cache_put(texto_norm, categoria)
+
+        if fuzzy:
+            scores = process.cdist(fuzzy, self.choices, scorer=fuzz.partial_ratio,
+                                   score_cutoff=self.min_score, dtype=np.float64, workers=workers)
+            # argmax devuelve el primer máximo: mismo desempate que el recorrido original
+            best = scores.argmax(axis=1)
+            for texto_norm, index, row in zip(fuzzy, best, scores):
+                if row[index] >= self.min_score:
+                    results[texto_norm] = self.categories[index]
+                self._cache_put(texto_norm, results[texto_norm])
+
+        return [results[texto_norm] for texto_norm in normalized]
+
+
+# Instancias compartidas por min_score (los patrones se normalizan una vez)
+_classifiers: Dict[int, SectionClassifier] = {}
+
+
+def get_section_classifier(min_score: int = 70) -> SectionClassifier:
+    """Obtener (o crear) el SectionClassifier compartido para un min_score"""
+    if min_score not in _classifiers:
+        _classifiers[min_score] = SectionClassifier(SECTION_PATTERNS, min_score)
+    return _classifiers[min_score]
+
+
 def section_classifier(texto: str, min_score: int = 70) -> Optional[str]:
     """
     Clasifica un texto en una categoría de sección.
     
+    Parámetros:
+        texto (str): Texto a clasificar (idealmente título o título + contenido)
+        min_score (int): Puntaje mínimo para considerar una coincidencia válida
+        
+    Retorna:
+        str | None: Nombre de la categoría o None si no hay match
+    """
+    return get_section_classifier(min_score).classify(texto)
+
+
+def classify_titles(textos: List[str], min_score: int = 70) -> List[Optional[str]]:
+    """
+    Clasificar una lista de textos en una sola pasada (ver SectionClassifier.classify_batch)
+    Retorna: Lista de categorías (o None) en el mismo orden que textos
+    """
+    return get_section_classifier(min_score).classify_batch(textos)
+
+
+def classify_content(contenido: str, min_score: int = 70) -> Optional[str]:
+    """Clasificar una sección por su contenido (ver SectionClassifier.classify_content)"""
+    return get_section_classifier(min_score).classify_content(contenido)
+
+
+def _section_classifier_reference(texto: str, min_score: int = 70) -> Optional[str]:
+    """
+    Implementación original (un partial_ratio por patrón), referencia para
+    verificar que SectionClassifier entrega los mismos resultados.
+    
     Parámetros:
         texto (str): Texto a clasificar (idealmente título o título + contenido)
         min_score (int): Puntaje mínimo para considerar una coincidencia válida
@@ -52,4 +316,16 @@ def section_classifier(texto: str, min_score: int = 70) -> Optional[str]:
                 best_score = score
                 best_match = categoria
     
-    return best_match if best_score >= min_score else None
\ No newline at end of file
+    return best_match if best_score >= min_score else None
+
+
+def classifier_version(min_score: int = 70, patterns: Dict[str, List[str]] = None) -> str:
+    """
+    Versión del clasificador: hash de SECTION_PATTERNS, min_score y CLASSIFIER_REVISION.
+    Cambia al editar los patrones, así las ofertas clasificadas antes quedan obsoletas.
+    """
+    if patterns is None:
+        patterns = SECTION_PATTERNS
+    payload = json.dumps([CLASSIFIER_REVISION, min_score, CONTENT_MIN_HITS, CONTENT_MIN_DENSITY, patterns],
+                         ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
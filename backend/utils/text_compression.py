@@ -0,0 +1,128 @@
+# backend/utils/text_compression.py
+
+"""
+Compresión transparente de columnas de texto (zstd con diccionario o zlib)
+Un valor comprimido se guarda como BLOB con un byte de formato al inicio; los
+valores TEXT se devuelven tal cual, así conviven filas comprimidas y sin
+comprimir. Las ofertas son textos cortos y parecidos entre sí: un diccionario
+zstd entrenado con nuestras propias ofertas mejora mucho la razón de compresión.
+"""
+
+import struct
+import threading
+import zlib
+from typing import Callable, Iterable, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # Dependencia opcional: sin ella se usa zlib
+    zstandard = None
+
+ZLIB_FORMAT = b'z'
+ZSTD_FORMAT = b's'              # Seguido del id del diccionario (0 = sin diccionario)
+_DICTIONARY_ID = struct.Struct('>I')
+
+
+def train_dictionary(samples: Iterable[str], size: int) -> Optional[bytes]:
+    """
+    Entrenar un diccionario zstd con textos de ejemplo
+    Returns: Bytes del diccionario, o None si zstd no está disponible o no alcanzan las muestras
+    """
+    if zstandard is None:
+        return None
+    encoded = [sample.encode('utf-8') for sample in samples if sample]
+    try:
+        return zstandard.train_dictionary(size, encoded).as_bytes()
+    except zstandard.ZstdError as e:
+        print(f"⚠ No se pudo entrenar el diccionario zstd ({len(encoded)} muestras): {e}")
+        return None
+
+
+class TextCodec:
+    """Codifica y decodifica valores de columnas de texto"""
+
+    def __init__(self, algorithm: Optional[str] = 'zstd', level: int = 9, min_bytes: int = 128,
+                 dictionary_loader: Optional[Callable[[int], Optional[bytes]]] = None):
+        """
+        Args:
+            algorithm: 'zstd', 'zlib' o None (no comprime, solo decodifica lo ya comprimido)
+            level: Nivel de compresión
+            min_bytes: Textos más cortos se guardan sin comprimir
+            dictionary_loader: Función id -> bytes para diccionarios que aún no están cargados
+        """
+        if algorithm == 'zstd' and zstandard is None:
+            print("⚠ 'zstandard' no está instalado, las columnas de texto usarán zlib")
+            algorithm = 'zlib'
+        self.algorithm = algorithm
+        self.level = level
+        self.min_bytes = min_bytes
+        self.dictionary_id = 0              # Diccionario usado al comprimir (0 = ninguno)
+        self._dictionaries = {}             # id -> zstandard.ZstdCompressionDict
+        self._dictionary_loader = dictionary_loader
+        self._local = threading.local()     # Los (des)compresores zstd no son thread-safe
+
+    def add_dictionary(self, dictionary_id: int, data: bytes, use: bool = True):
+        """
+        Registrar un diccionario zstd
+        Args: use: True lo deja como el diccionario para comprimir de aquí en adelante
+        """
+        self._dictionaries[dictionary_id] = zstandard.ZstdCompressionDict(data)
+        if use:
+            self.dictionary_id = dictionary_id
+
+    def _dictionary(self, dictionary_id: int):
+        if not dictionary_id:
+            return None
+        if dictionary_id not in self._dictionaries:
+            # Entrenado por otro proceso después de cargar el codec
+            data = self._dictionary_loader(dictionary_id) if self._dictionary_loader else None
+            if data is None:
+                raise ValueError(f"Diccionario de compresión {dictionary_id} no encontrado")
+            self.add_dictionary(dictionary_id, data, use=False)
+        return self._dictionaries[dictionary_id]
+
+    def _zstd(self, kind: str, dictionary_id: int):
+        """(Des)compresor zstd del hilo actual para un diccionario"""
+        cache = self._local.__dict__.setdefault(kind, {})
+        if dictionary_id not in cache:
+            dictionary = self._dictionary(dictionary_id)
+            if kind == 'compressor':
+                # El id del diccionario ya va en nuestro encabezado
+                cache[dictionary_id] = zstandard.ZstdCompressor(
+                    level=self.level, dict_data=dictionary, write_dict_id=False
+                )
+            else:
+                cache[dictionary_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+        return cache[dictionary_id]
+
+    def encode(self, text: Optional[str]) -> Union[str, bytes, None]:
+        """
+        Comprimir un texto para guardarlo
+        Returns: BLOB comprimido, o el mismo texto si es corto o no se gana espacio
+        """
+        if text is None or self.algorithm is None:
+            return text
+        raw = text.encode('utf-8')
+        if len(raw) < self.min_bytes:
+            return text
+        if self.algorithm == 'zstd':
+            compressor = self._zstd('compressor', self.dictionary_id)
+            value = ZSTD_FORMAT + _DICTIONARY_ID.pack(self.dictionary_id) + compressor.compress(raw)
+        else:
+            value = ZLIB_FORMAT + zlib.compress(raw, self.level)
+        return value if len(value) < len(raw) else text
+
+    def decode(self, value: Union[str, bytes, None]) -> Optional[str]:
+        """Devolver el texto original de un valor guardado (comprimido o no)"""
+        if not isinstance(value, bytes):
+            return value
+        marker, payload = value[:1], value[1:]
+        if marker == ZLIB_FORMAT:
+            return zlib.decompress(payload).decode('utf-8')
+        if marker == ZSTD_FORMAT:
+            if zstandard is None:
+                raise RuntimeError("El valor está en zstd y el paquete 'zstandard' no está instalado")
+            (dictionary_id,) = _DICTIONARY_ID.unpack_from(payload)
+            decompressor = self._zstd('decompressor', dictionary_id)
+            return decompressor.decompress(payload[_DICTIONARY_ID.size:]).decode('utf-8')
+        raise ValueError(f"Formato de compresión desconocido: {marker!r}")
@@ -0,0 +1,26 @@
+# tests/conftest.py
+
+"""
+Configuración común de pytest: el código vive en backend/ y se importa con
+imports absolutos (igual que al correr `python main.py` desde backend/)
+"""
+
+import os
+import sys
+
+import pytest
+
+BACKEND_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    """Base SQLite vacía en un directorio temporal (no toca data/jobs.db)"""
+    import database
+
+    monkeypatch.setattr(database, 'DB_PATH', str(tmp_path / 'jobs.db'))
+    database.create_tables()
+    yield database.DB_PATH
+    database.close_db_connections()
@@ -0,0 +1,152 @@
+# tests/test_storage.py
+
+"""
+Contrato de los backends de almacenamiento (storage/): las mismas pruebas
+corren contra SQLite y contra PostgreSQL. PostgreSQL solo se prueba si
+JOBRADAR_TEST_POSTGRES_DSN apunta a una base de pruebas; cada corrida usa un
+schema propio que se elimina al terminar
+"""
+
+import os
+import uuid
+
+import pytest
+
+TEST_POSTGRES_DSN = os.environ.get('JOBRADAR_TEST_POSTGRES_DSN')
+
+
+@pytest.fixture
+def postgres_storage():
+    if not TEST_POSTGRES_DSN:
+        pytest.skip("JOBRADAR_TEST_POSTGRES_DSN no definido")
+    psycopg = pytest.importorskip("psycopg")
+    from psycopg.conninfo import make_conninfo
+    from storage.postgres import PostgresStorage
+
+    schema = f"jobradar_test_{uuid.uuid4().hex[:8]}"
+    with psycopg.connect(TEST_POSTGRES_DSN, autocommit=True) as conn:
+        conn.execute(f"CREATE SCHEMA {schema}")
+    storage = PostgresStorage(make_conninfo(TEST_POSTGRES_DSN, options=f"-c search_path={schema}"), max_size=4)
+    try:
+        storage.create_tables()
+        yield storage
+    finally:
+        storage.close()
+        with psycopg.connect(TEST_POSTGRES_DSN, autocommit=True) as conn:
+            conn.execute(f"DROP SCHEMA {schema} CASCADE")
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def storage(request):
+    if request.param == 'sqlite':
+        request.getfixturevalue('sqlite_db')
+        from storage.sqlite import SQLiteStorage
+        store = SQLiteStorage()
+        yield store
+        store.close()
+    else:
+        yield request.getfixturevalue('postgres_storage')
+
+
+def _job(job_id: str, **fields) -> dict:
+    job = {
+        'job_id': job_id,
+        'source_url': f"https://www.getonbrd.com/jobs/programming/{job_id}",
+        'portal_name': 'getonbrd.com',
+        'scraped_at': '2024-05-02T10:00:00',
+        'posted_date': '2024-05-01',
+        'job_title_raw': f"Backend Developer {job_id}",
+        'company_name_raw': 'ACME',
+        'tech_stack_raw': ['Python', 'PostgreSQL'],
+        'sections_raw': [{'title': 'Requisitos', 'content': 'Python'}],
+    }
+    job.update(fields)
+    return job
+
+
+def _urls(count: int, prefix: str = 'job') -> list:
+    return [(f"https://www.getonbrd.com/jobs/programming/{prefix}-{i}", '2024-05-01', 'programming')
+            for i in range(count)]
+
+
+def test_insert_job_urls_ignores_duplicates(storage):
+    urls = _urls(3)
+    # Repetidas dentro del lote (DISTINCT ON en postgres) y contra lo ya guardado (ON CONFLICT)
+    assert storage.insert_job_urls(urls + urls[:1], portal='getonbrd.com') == 3
+    assert storage.insert_job_urls(urls[1:] + _urls(1, 'new'), portal='getonbrd.com') == 1
+
+    assert sorted(storage.get_all_urls()) == sorted([url for url, _, _ in urls + _urls(1, 'new')])
+    assert storage.count_job_urls() == 4
+    assert storage.count_job_urls(processed=False) == 4
+    assert storage.count_job_urls(processed=True) == 0
+    assert storage.get_job_count_by_portal() == [('getonbrd.com', 4)]
+
+
+def test_iter_job_urls_pages_newest_first(storage):
+    storage.insert_job_urls(_urls(7), portal='getonbrd.com')
+
+    rows = list(storage.iter_job_urls(chunk_size=3))
+    ids = [row['id'] for row in rows]
+    assert len(rows) == 7
+    assert ids == sorted(ids, reverse=True)
+    assert rows[0]['url'].endswith('job-6')
+
+
+def test_save_job_offers_marks_urls_processed(storage):
+    storage.insert_job_urls(_urls(3), portal='getonbrd.com')
+    rows = list(storage.iter_job_urls(processed=False))
+
+    # Dos URLs con el mismo job_id en el lote: se guarda una sola oferta
+    batch = [(_job('a'), rows[0]['id']), (_job('a'), rows[1]['id'])]
+    assert storage.save_job_offers(batch) == 1
+    assert storage.count_job_urls(processed=True) == 2
+    assert [row['id'] for row in storage.iter_job_urls(processed=False)] == [rows[2]['id']]
+
+    # Ofertas ya guardadas no cuentan como nuevas
+    assert storage.save_job_offers([(_job('a'), rows[2]['id'])]) == 0
+    assert storage.count_job_urls(processed=False) == 0
+
+
+def test_upsert_job_offers_and_top_technologies(storage):
+    storage.insert_job_urls(_urls(2), portal='getonbrd.com')
+    rows = list(storage.iter_job_urls())
+    storage.save_job_offers([(_job('a'), rows[0]['id']), (_job('b', tech_stack_raw=['python ', 'Go']), rows[1]['id'])])
+
+    assert storage.upsert_job_offers([_job('a', tech_stack_raw=['Go']), _job('c', tech_stack_raw=['Go'])]) == 2
+
+    top = dict(storage.get_top_technologies())
+    assert top['Go'] == 3
+    assert {name.lower(): count for name, count in top.items()}['python'] == 1
+    assert storage.get_top_technologies(since='2030-01-01') == []
+
+
+def test_claim_job_urls_respects_limit(storage):
+    storage.insert_job_urls(_urls(5), portal='getonbrd.com')
+
+    claimed = list(storage.claim_job_urls(3))
+    ids = [row['id'] for row in claimed]
+    assert len(claimed) == 3
+    assert ids == sorted(ids, reverse=True)
+    assert all(not row['processed'] for row in claimed)
+
+
+def test_claim_job_urls_is_exclusive(postgres_storage):
+    postgres_storage.insert_job_urls(_urls(5), portal='getonbrd.com')
+
+    # Otro host reservando a la vez no recibe las URLs ya reservadas
+    first = {row['id'] for row in postgres_storage.claim_job_urls(3, batch_size=2)}
+    second = {row['id'] for row in postgres_storage.claim_job_urls()}
+    assert len(first) == 3 and len(second) == 2
+    assert not first & second
+    assert list(postgres_storage.claim_job_urls()) == []
+
+    # Vencido el lease, las URLs no procesadas vuelven a estar disponibles
+    assert len(list(postgres_storage.claim_job_urls(lease_minutes=0))) == 5
+
+
+def test_claim_job_urls_skips_processed(postgres_storage):
+    postgres_storage.insert_job_urls(_urls(2), portal='getonbrd.com')
+    claimed = list(postgres_storage.claim_job_urls())
+    postgres_storage.save_job_offers([(_job('a'), claimed[0]['id'])])
+
+    assert [row['id'] for row in postgres_storage.claim_job_urls(lease_minutes=0)] == [claimed[1]['id']]